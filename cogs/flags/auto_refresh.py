@@ -2,15 +2,29 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
 
 import discord
 from discord.ext import commands
 
 from cogs import utils
-from cogs.ui.flag_views import FlagManageView
+from cogs.ui.flag_views import (
+    AssignFlagButton,
+    FlagManageView,
+    ReleaseFlagButton,
+)
 
 log = logging.getLogger("dayz-manager")
 
+# Boards restored at once across all guilds. Edits to one channel
+# share a Discord rate-limit bucket, so they are also serialised.
+RESTORE_CONCURRENCY = 4
+
+# Log progress after roughly this share of sessions has finished.
+PROGRESS_STEP = 0.1
+
 
 class AutoRefresh(commands.Cog):
     """Restores every persistent flag message after startup/reconnect."""
@@ -18,6 +32,12 @@ class AutoRefresh(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
+    async def cog_load(self) -> None:
+        self.bot.add_dynamic_items(AssignFlagButton, ReleaseFlagButton)
+
+    async def cog_unload(self) -> None:
+        self.bot.remove_dynamic_items(AssignFlagButton, ReleaseFlagButton)
+
     async def restore(
         self,
         guild: discord.Guild,
@@ -25,7 +45,29 @@ class AutoRefresh(commands.Cog):
         server: str,
         channel_id: str,
         message_id: str,
+        render_hash: str | None = None,
     ) -> None:
+        view = FlagManageView(
+            guild,
+            map_key,
+            server,
+            self.bot,
+        )
+
+        embed = await utils.create_flag_embed(
+            str(guild.id),
+            map_key,
+            server,
+            guild,
+        )
+
+        digest = utils.board_digest(embed)
+
+        # The message already shows this board. Its buttons are served
+        # by the dynamic items registered in cog_load.
+        if render_hash == digest:
+            return
+
         channel = guild.get_channel(int(channel_id))
 
         if not isinstance(channel, discord.TextChannel):
@@ -35,9 +77,13 @@ class AutoRefresh(commands.Cog):
             )
             return
 
+        # A partial message is enough to edit; no GET is needed.
+        message = channel.get_partial_message(int(message_id))
+
         try:
-            message = await channel.fetch_message(int(message_id))
+            await message.edit(embed=embed, view=view)
         except discord.NotFound:
+            utils.invalidate_flag_message(str(guild.id), map_key, server)
             log.warning(
                 "Flag message missing | guild=%s map=%s server=%s",
                 guild.id, map_key, server
@@ -45,41 +91,82 @@ class AutoRefresh(commands.Cog):
             return
         except discord.Forbidden:
             log.warning(
-                "No permission to read flag message | guild=%s",
+                "No permission to edit flag message | guild=%s",
                 guild.id
             )
             return
         except discord.HTTPException:
-            log.exception("Discord error reading flag message.")
+            log.exception(
+                "Failed to refresh flag message | guild=%s map=%s server=%s",
+                guild.id, map_key, server
+            )
             return
 
-        view = FlagManageView(
-            guild,
+        await utils.save_render_hash(
+            str(guild.id),
             map_key,
             server,
-            self.bot,
+            digest,
         )
 
-        embed = await utils.create_flag_embed(
-            str(guild.id),
-            map_key,
-            server,
-            guild,
+    async def restore_all(
+        self,
+        sessions: list[tuple[discord.Guild, dict]],
+    ) -> None:
+        """
+        Restore sessions with bounded concurrency.
+
+        Sessions are started in the order given; at most
+        RESTORE_CONCURRENCY run at once and never two in one channel.
+        """
+
+        total = len(sessions)
+        done = 0
+        next_report = PROGRESS_STEP
+        started = time.perf_counter()
+
+        semaphore = asyncio.Semaphore(RESTORE_CONCURRENCY)
+        channel_locks: defaultdict[str, asyncio.Lock] = defaultdict(
+            asyncio.Lock
         )
 
-        try:
-            self.bot.add_view(view, message_id=message.id)
-        except ValueError:
-            # Already registered.
-            pass
+        async def run(guild: discord.Guild, row) -> None:
+            nonlocal done, next_report
+
+            async with channel_locks[row["channel_id"]]:
+                async with semaphore:
+                    try:
+                        await self.restore(
+                            guild,
+                            row["map"],
+                            row["server"],
+                            row["channel_id"],
+                            row["message_id"],
+                            row["render_hash"],
+                        )
+                    except Exception:
+                        log.exception(
+                            "Failed restoring flag session | guild=%s map=%s server=%s",
+                            guild.id, row["map"], row["server"]
+                        )
+
+            done += 1
+
+            if done / total >= next_report:
+                next_report += PROGRESS_STEP
+                log.info(
+                    "Restored %d/%d flag sessions (%.1fs).",
+                    done, total, time.perf_counter() - started
+                )
 
-        try:
-            await message.edit(embed=embed, view=view)
-        except discord.HTTPException:
-            log.exception(
-                "Failed to refresh flag message | guild=%s map=%s server=%s",
-                guild.id, map_key, server
-            )
+        await asyncio.gather(
+            *(run(guild, row) for guild, row in sessions)
+        )
+
+        log.info(
+            "Persistent flag restoration complete | sessions=%d time=%.1fs",
+            total, time.perf_counter() - started
+        )
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
@@ -91,25 +178,36 @@ class AutoRefresh(commands.Cog):
 
         log.info("Restoring persistent flag views...")
 
-        for guild in self.bot.guilds:
-            try:
-                sessions = await utils.get_flag_sessions(str(guild.id))
-                for row in sessions:
-                    await self.restore(
-                        guild,
-                        row["map"],
-                        row["server"],
-                        row["channel_id"],
-                        row["message_id"],
-                    )
-                    await asyncio.sleep(0.25)
-            except Exception:
-                log.exception(
-                    "Failed restoring flag sessions for guild %s.",
-                    guild.id
-                )
+        guilds = {
+            str(guild.id): guild
+            for guild in self.bot.guilds
+        }
+
+        # Two queries for every board and flag row of every guild;
+        # this also warms the caches the restores render from.
+        try:
+            grouped = await utils.preload_sessions(list(guilds))
+        except Exception:
+            log.exception("Failed loading flag sessions.")
+
+            # Let the next READY try again.
+            self.bot._auto_refresh_done = False
+            return
+
+        sessions: list[tuple[discord.Guild, dict]] = [
+            (guilds[guild_id], row)
+            for guild_id, rows in grouped.items()
+            for row in rows
+        ]
+
+        # Recently active boards first, across every guild.
+        oldest = datetime.min.replace(tzinfo=timezone.utc)
+        sessions.sort(
+            key=lambda item: item[1]["last_activity"] or oldest,
+            reverse=True,
+        )
 
-        log.info("Persistent flag restoration complete.")
+        await self.restore_all(sessions)
 
 
 async def setup(bot: commands.Bot):
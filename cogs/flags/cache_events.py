@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import logging
+from typing import Sequence
+
+import discord
+from discord.ext import commands
+
+from cogs import utils
+
+log = logging.getLogger("dayz-manager")
+
+
+class CacheEvents(commands.Cog):
+    """Keeps the in-memory flag caches in step with guild changes."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        # A READY that isn't a resume replaces every Guild without
+        # replaying role or emoji events, and the indexes still hold
+        # objects from the old ones.
+        utils.invalidate_role_index()
+        utils.invalidate_emoji_index()
+
+    @commands.Cog.listener()
+    async def on_guild_emojis_update(
+        self,
+        guild: discord.Guild,
+        before: Sequence[discord.Emoji],
+        after: Sequence[discord.Emoji],
+    ) -> None:
+        utils.invalidate_emoji_index(guild.id)
+
+        # Boards render custom flag emojis, so they may now differ.
+        for key in utils.cached_sessions(str(guild.id)):
+            utils.schedule_flag_refresh(self.bot, *key)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(
+        self,
+        role: discord.Role,
+    ) -> None:
+        utils.invalidate_role_index(role.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(
+        self,
+        before: discord.Role,
+        after: discord.Role,
+    ) -> None:
+        utils.invalidate_role_index(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(
+        self,
+        role: discord.Role,
+    ) -> None:
+        utils.invalidate_role_index(role.guild.id)
+
+        # Flags held by a deleted role would otherwise render as
+        # @deleted-role forever.
+        rows = await utils.release_role_flags(
+            str(role.guild.id),
+            role.id,
+        )
+
+        if not rows:
+            return
+
+        sessions = {
+            utils.session_key(
+                row["guild_id"],
+                row["map"],
+                row["server"],
+            )
+            for row in rows
+        }
+
+        for key in sessions:
+            utils.schedule_flag_refresh(self.bot, *key)
+
+        log.info(
+            "Released %d flag(s) across %d board(s) held by deleted "
+            "role %s in guild %s.",
+            len(rows),
+            len(sessions),
+            role.id,
+            role.guild.id,
+        )
+
+    @commands.Cog.listener()
+    async def on_guild_remove(
+        self,
+        guild: discord.Guild,
+    ) -> None:
+        utils.invalidate_emoji_index(guild.id)
+        utils.invalidate_role_index(guild.id)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(CacheEvents(bot))
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from typing import Iterable
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
 from cogs import utils
-from cogs.helpers.decorators import MAP_CHOICES, admin_only, normalize_map
-from cogs.ui.flag_views import FlagManageView
+from cogs.helpers.decorators import (
+    MAP_CHOICES,
+    admin_only,
+    normalize_map,
+    server_autocomplete,
+)
+from cogs.ui.flag_views import BUSY_MESSAGE
 
 log = logging.getLogger("dayz-manager")
 
@@ -22,16 +29,39 @@ class FlagManagement(commands.Cog):
         interaction: discord.Interaction,
         current: str,
     ) -> list[app_commands.Choice[str]]:
-        current = current.casefold()
 
         return [
             app_commands.Choice(
                 name=flag,
                 value=flag,
             )
-            for flag in utils.FLAGS
-            if current in flag.casefold()
-        ][:25]
+            for flag in utils.search_flags(current)[:25]
+        ]
+
+    async def flag_list_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str,
+    ) -> list[app_commands.Choice[str]]:
+
+        # Complete only the last entry of a comma/space separated list.
+        cut = max(
+            current.rfind(","),
+            current.rfind(" "),
+        ) + 1
+
+        head, tail = current[:cut], current[cut:]
+
+        if head and not head.endswith(" "):
+            head += " "
+
+        return [
+            app_commands.Choice(
+                name=(head + flag)[:100],
+                value=(head + flag)[:100],
+            )
+            for flag in utils.search_flags(tail)[:25]
+        ]
 
     def base_embed(
         self,
@@ -54,6 +84,45 @@ class FlagManagement(commands.Cog):
 
         return embed
 
+    @staticmethod
+    def add_budgeted_fields(
+        embed: discord.Embed,
+        items: Iterable[tuple[str, str]],
+    ) -> int:
+        """
+        Add (name, value) fields until a Discord embed limit is hit.
+
+        Embeds hold at most 25 fields and 6000 characters. Returns how
+        many fields were added.
+        """
+
+        budget = 5500 - len(embed.description or "")
+        shown = 0
+
+        for name, value in items:
+            if shown == 25:
+                break
+
+            name = name[:256]
+
+            if len(value) > 1024:
+                value = value[:1021] + "..."
+
+            budget -= len(name) + len(value)
+
+            if budget < 0:
+                break
+
+            embed.add_field(
+                name=name,
+                value=value,
+                inline=False,
+            )
+
+            shown += 1
+
+        return shown
+
     # =========================================================
     # ASSIGN
     # =========================================================
@@ -73,7 +142,8 @@ class FlagManagement(commands.Cog):
         role="Role to assign.",
     )
     @app_commands.autocomplete(
-        flag=flag_autocomplete
+        flag=flag_autocomplete,
+        server=server_autocomplete,
     )
     async def assign(
         self,
@@ -135,13 +205,20 @@ class FlagManagement(commands.Cog):
             thinking=True
         )
 
-        result = await utils.claim_flag(
-            str(guild.id),
-            map_key,
-            server,
-            flag_name,
-            str(role.id),
-        )
+        try:
+            result = await utils.claim_flag(
+                str(guild.id),
+                map_key,
+                server,
+                flag_name,
+                str(role.id),
+                actor_id=interaction.user.id,
+            )
+        except asyncio.TimeoutError:
+            return await interaction.followup.send(
+                BUSY_MESSAGE,
+                ephemeral=True,
+            )
 
         if not result:
             return await interaction.followup.send(
@@ -153,15 +230,13 @@ class FlagManagement(commands.Cog):
         # Refresh the public flag message.
         # -----------------------------------------------------
 
-        view = FlagManageView(
-            guild,
+        utils.schedule_flag_refresh(
+            self.bot,
+            str(guild.id),
             map_key,
             server,
-            self.bot,
         )
 
-        await view.refresh_message()
-
         # -----------------------------------------------------
         # Confirmation embed.
         # -----------------------------------------------------
@@ -200,7 +275,8 @@ class FlagManagement(commands.Cog):
         flag="Flag to release.",
     )
     @app_commands.autocomplete(
-        flag=flag_autocomplete
+        flag=flag_autocomplete,
+        server=server_autocomplete,
     )
     async def release_cmd(
         self,
@@ -240,12 +316,19 @@ class FlagManagement(commands.Cog):
             thinking=True
         )
 
-        result = await utils.release_flag(
-            str(guild.id),
-            map_key,
-            server,
-            flag_name,
-        )
+        try:
+            result = await utils.release_flag(
+                str(guild.id),
+                map_key,
+                server,
+                flag_name,
+                actor_id=interaction.user.id,
+            )
+        except asyncio.TimeoutError:
+            return await interaction.followup.send(
+                BUSY_MESSAGE,
+                ephemeral=True,
+            )
 
         if not result:
             return await interaction.followup.send(
@@ -257,15 +340,13 @@ class FlagManagement(commands.Cog):
         # Refresh the public flag message.
         # -----------------------------------------------------
 
-        view = FlagManageView(
-            guild,
+        utils.schedule_flag_refresh(
+            self.bot,
+            str(guild.id),
             map_key,
             server,
-            self.bot,
         )
 
-        await view.refresh_message()
-
         # -----------------------------------------------------
         # Confirmation embed.
         # -----------------------------------------------------
@@ -285,6 +366,477 @@ class FlagManagement(commands.Cog):
             embed=embed
         )
 
+    # =========================================================
+    # BULK ASSIGN / RELEASE
+    # =========================================================
+
+    def parse_flag_list(
+        self,
+        value: str,
+    ) -> list[str]:
+
+        tokens = [
+            token
+            for token in value.replace(",", " ").split()
+            if token
+        ]
+
+        if any(
+            token.casefold() == "all"
+            for token in tokens
+        ):
+            return list(utils.FLAGS)
+
+        return tokens
+
+    def outcome_lines(
+        self,
+        outcomes: dict,
+    ) -> tuple[list[str], list[str], list[str]]:
+
+        changed = [
+            flag
+            for flag, row in outcomes.items()
+            if row is not None
+        ]
+
+        unchanged = [
+            flag
+            for flag, row in outcomes.items()
+            if row is None
+            and utils.normalize_flag(flag) == flag
+        ]
+
+        invalid = [
+            flag
+            for flag, row in outcomes.items()
+            if row is None
+            and utils.normalize_flag(flag) != flag
+        ]
+
+        return changed, unchanged, invalid
+
+    def add_outcome_fields(
+        self,
+        embed: discord.Embed,
+        *groups: tuple[str, list[str]],
+    ) -> None:
+
+        for name, flags in groups:
+            if not flags:
+                continue
+
+            embed.add_field(
+                name=f"{name} ({len(flags)})",
+                value=", ".join(
+                    f"`{flag}`"
+                    for flag in flags
+                )[:1024],
+                inline=False,
+            )
+
+    @app_commands.command(
+        name="assignmany",
+        description="Assign several flags to a role at once.",
+    )
+    @admin_only()
+    @app_commands.choices(
+        selected_map=MAP_CHOICES
+    )
+    @app_commands.describe(
+        selected_map="Map for these flags.",
+        server="Server name/identifier.",
+        flags="Flag names separated by commas or spaces, or 'all'.",
+        role="Role to assign.",
+    )
+    @app_commands.autocomplete(
+        flags=flag_list_autocomplete,
+        server=server_autocomplete,
+    )
+    async def assign_many(
+        self,
+        interaction: discord.Interaction,
+        selected_map: app_commands.Choice[str],
+        server: str,
+        flags: str,
+        role: discord.Role,
+    ):
+
+        guild = interaction.guild
+
+        if guild is None:
+            return await interaction.response.send_message(
+                "❌ Server only.",
+                ephemeral=True,
+            )
+
+        if role.is_default() or role.managed:
+            return await interaction.response.send_message(
+                "❌ That role cannot be assigned to a flag.",
+                ephemeral=True,
+            )
+
+        requested = self.parse_flag_list(
+            flags
+        )
+
+        if not requested:
+            return await interaction.response.send_message(
+                "❌ List at least one flag.",
+                ephemeral=True,
+            )
+
+        map_key = normalize_map(
+            selected_map
+        )
+
+        server = utils.normalize_server(
+            server
+        )
+
+        await interaction.response.defer(
+            thinking=True
+        )
+
+        try:
+            outcomes = await utils.claim_flags(
+                str(guild.id),
+                map_key,
+                server,
+                requested,
+                str(role.id),
+                actor_id=interaction.user.id,
+            )
+        except asyncio.TimeoutError:
+            return await interaction.followup.send(
+                BUSY_MESSAGE,
+                ephemeral=True,
+            )
+
+        changed, unchanged, invalid = self.outcome_lines(
+            outcomes
+        )
+
+        if changed:
+            utils.schedule_flag_refresh(
+                self.bot,
+                str(guild.id),
+                map_key,
+                server,
+            )
+
+        embed = self.base_embed(
+            "🏴 Flags Assigned",
+            (
+                f"**Map:** `{map_key.title()}`\n"
+                f"**Server:** `{server}`\n"
+                f"**Role:** {role.mention}\n"
+                f"**By:** {interaction.user.mention}"
+            ),
+            0x2ECC71 if changed else 0xF39C12,
+        )
+
+        self.add_outcome_fields(
+            embed,
+            ("🟥 Assigned", changed),
+            ("⚠️ Already claimed or not set up", unchanged),
+            ("❌ Invalid", invalid),
+        )
+
+        await interaction.followup.send(
+            embed=embed
+        )
+
+    @app_commands.command(
+        name="releasemany",
+        description="Release several flags back to the available pool.",
+    )
+    @admin_only()
+    @app_commands.choices(
+        selected_map=MAP_CHOICES
+    )
+    @app_commands.describe(
+        selected_map="Map containing the flags.",
+        server="Server name/identifier.",
+        flags="Flag names separated by commas or spaces, or 'all'.",
+    )
+    @app_commands.autocomplete(
+        flags=flag_list_autocomplete,
+        server=server_autocomplete,
+    )
+    async def release_many(
+        self,
+        interaction: discord.Interaction,
+        selected_map: app_commands.Choice[str],
+        server: str,
+        flags: str,
+    ):
+
+        guild = interaction.guild
+
+        if guild is None:
+            return await interaction.response.send_message(
+                "❌ Server only.",
+                ephemeral=True,
+            )
+
+        requested = self.parse_flag_list(
+            flags
+        )
+
+        if not requested:
+            return await interaction.response.send_message(
+                "❌ List at least one flag.",
+                ephemeral=True,
+            )
+
+        map_key = normalize_map(
+            selected_map
+        )
+
+        server = utils.normalize_server(
+            server
+        )
+
+        await interaction.response.defer(
+            thinking=True
+        )
+
+        try:
+            outcomes = await utils.release_flags(
+                str(guild.id),
+                map_key,
+                server,
+                requested,
+                actor_id=interaction.user.id,
+            )
+        except asyncio.TimeoutError:
+            return await interaction.followup.send(
+                BUSY_MESSAGE,
+                ephemeral=True,
+            )
+
+        changed, unchanged, invalid = self.outcome_lines(
+            outcomes
+        )
+
+        if changed:
+            utils.schedule_flag_refresh(
+                self.bot,
+                str(guild.id),
+                map_key,
+                server,
+            )
+
+        embed = self.base_embed(
+            "🏳️ Flags Released",
+            (
+                f"**Map:** `{map_key.title()}`\n"
+                f"**Server:** `{server}`\n"
+                f"**By:** {interaction.user.mention}"
+            ),
+            0x95A5A6 if changed else 0xF39C12,
+        )
+
+        self.add_outcome_fields(
+            embed,
+            ("🟩 Released", changed),
+            ("⚠️ Already unclaimed or not set up", unchanged),
+            ("❌ Invalid", invalid),
+        )
+
+        await interaction.followup.send(
+            embed=embed
+        )
+
+    # =========================================================
+    # FACTIONS
+    # =========================================================
+
+    def role_member_count(
+        self,
+        role: discord.Role,
+    ) -> int:
+
+        # Prefer the RoleList membership index when it is loaded.
+        role_list = self.bot.get_cog("RoleList")
+
+        if role_list is not None:
+            count = role_list.indexed_role_count(
+                role.guild.id,
+                role.id,
+            )
+
+            if count is not None:
+                return count
+
+        return len(role.members)
+
+    @staticmethod
+    def holding_lines(
+        holdings: list,
+    ) -> list[str]:
+
+        return [
+            f"`{row['map'].title()}` / `{row['server']}`: "
+            + ", ".join(row["flags"])
+            for row in holdings
+        ]
+
+    @app_commands.command(
+        name="factions",
+        description="List faction roles with their members and held flags.",
+    )
+    @admin_only()
+    async def factions(
+        self,
+        interaction: discord.Interaction,
+    ):
+
+        guild = interaction.guild
+
+        if guild is None:
+            return await interaction.response.send_message(
+                "❌ Server only.",
+                ephemeral=True,
+            )
+
+        roles = sorted(
+            (
+                guild.get_role(role_id)
+                for role_id in utils.faction_role_ids(guild)
+            ),
+            key=lambda role: (
+                -role.position,
+                role.name.casefold(),
+            ),
+        )
+
+        if not roles:
+            return await interaction.response.send_message(
+                f"❌ No `{utils.FACTION_ROLE_PREFIX}` roles in this server.",
+                ephemeral=True,
+            )
+
+        await interaction.response.defer(
+            thinking=True
+        )
+
+        holdings = await utils.get_flag_holdings_by_roles(
+            str(guild.id),
+            [role.id for role in roles],
+        )
+
+        embed = self.base_embed(
+            "🏴 Factions",
+            f"**{len(roles)}** faction role(s) in **{guild.name}**.",
+            0x3498DB,
+        )
+
+        def faction_fields():
+            for role in roles:
+                held = holdings.get(str(role.id), [])
+
+                flag_count = sum(
+                    len(row["flags"])
+                    for row in held
+                )
+
+                value = (
+                    f"👥 **{self.role_member_count(role)}** member(s)"
+                    f"  •  🚩 **{flag_count}** flag(s)"
+                )
+
+                lines = self.holding_lines(held)
+
+                if lines:
+                    value += "\n" + "\n".join(lines)
+
+                yield role.name, value
+
+        shown = self.add_budgeted_fields(
+            embed,
+            faction_fields(),
+        )
+
+        if shown < len(roles):
+            embed.description += (
+                f"\nShowing the first {shown} of {len(roles)}."
+            )
+
+        await interaction.followup.send(
+            embed=embed
+        )
+
+    # =========================================================
+    # HOLDINGS
+    # =========================================================
+
+    @app_commands.command(
+        name="holdings",
+        description="Show every flag a role holds across all maps and servers.",
+    )
+    @admin_only()
+    @app_commands.describe(
+        role="Role to look up.",
+    )
+    async def holdings(
+        self,
+        interaction: discord.Interaction,
+        role: discord.Role,
+    ):
+
+        guild = interaction.guild
+
+        if guild is None:
+            return await interaction.response.send_message(
+                "❌ Server only.",
+                ephemeral=True,
+            )
+
+        await interaction.response.defer(
+            thinking=True
+        )
+
+        held = await utils.get_role_holdings(
+            str(guild.id),
+            role.id,
+        )
+
+        flag_count = sum(
+            len(row["flags"])
+            for row in held
+        )
+
+        embed = self.base_embed(
+            "🚩 Flag Holdings",
+            (
+                f"{role.mention} holds **{flag_count}** flag(s) "
+                f"across **{len(held)}** server(s)."
+            ),
+            role.color.value or 0x3498DB,
+        )
+
+        shown = self.add_budgeted_fields(
+            embed,
+            (
+                (
+                    f"{row['map'].title()} / {row['server']}",
+                    ", ".join(row["flags"]),
+                )
+                for row in held
+            ),
+        )
+
+        if shown < len(held):
+            embed.description += (
+                f"\nShowing the first {shown} of {len(held)} servers."
+            )
+
+        await interaction.followup.send(
+            embed=embed
+        )
+
 
 # =========================================================
 # SETUP
@@ -7,7 +7,12 @@ from discord import Embed, Interaction, app_commands
 from discord.ext import commands
 
 from cogs import utils
-from cogs.helpers.decorators import MAP_CHOICES, admin_only, normalize_map
+from cogs.helpers.decorators import (
+    MAP_CHOICES,
+    admin_only,
+    normalize_map,
+    server_autocomplete,
+)
 from cogs.ui.flag_views import FlagManageView
 
 log = logging.getLogger("dayz-manager")
@@ -61,6 +66,7 @@ class Setup(commands.Cog):
         selected_map="Map for this flag system.",
         server="Server name/identifier, e.g. Livonia #1.",
     )
+    @app_commands.autocomplete(server=server_autocomplete)
     async def setup(
         self,
         interaction: Interaction,
@@ -146,10 +152,9 @@ class Setup(commands.Cog):
                 server,
                 str(channel.id),
                 str(message.id),
+                utils.board_digest(embed),
             )
 
-            self.bot.add_view(view, message_id=message.id)
-
             await interaction.edit_original_response(
                 embed=Embed(
                     title="✅ SETUP COMPLETE",
@@ -22,6 +22,50 @@ def normalize_map(
     return utils.normalize_map(str(map_choice))
 
 
+async def server_autocomplete(
+    interaction: discord.Interaction,
+    current: str,
+) -> list[app_commands.Choice[str]]:
+    """Suggest servers that already have a flag board, from memory."""
+
+    if interaction.guild is None:
+        return []
+
+    selected_map = getattr(
+        interaction.namespace,
+        "selected_map",
+        None,
+    )
+
+    servers = utils.known_servers(
+        str(interaction.guild.id),
+        selected_map,
+    )
+
+    current = utils.normalize_server(current)
+
+    prefix = [
+        server
+        for server in servers
+        if server.startswith(current)
+    ]
+
+    infix = [
+        server
+        for server in servers
+        if current in server
+        and not server.startswith(current)
+    ]
+
+    return [
+        app_commands.Choice(
+            name=server[:100],
+            value=server[:100],
+        )
+        for server in (prefix + infix)[:25]
+    ]
+
+
 def admin_only():
     async def predicate(interaction: discord.Interaction) -> bool:
         if interaction.guild is None:
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
 import asyncio
-import hashlib
 import logging
+from typing import Awaitable, Callable
 
 import discord
 from discord.ext import commands
@@ -13,10 +13,13 @@ log = logging.getLogger("dayz-manager")
 
 MAX_SELECT_OPTIONS = 25
 
+BUSY_MESSAGE = (
+    "⚠️ Another flag action on this board is taking too long. "
+    "Please try again."
+)
 
-class FlagManageView(discord.ui.View):
-    _locks: dict[str, asyncio.Lock] = {}
 
+class FlagManageView(discord.ui.View):
     def __init__(
         self,
         guild: discord.Guild | None,
@@ -31,93 +34,39 @@ class FlagManageView(discord.ui.View):
         self.map_key = utils.normalize_map(map_key)
         self.server = utils.normalize_server(server)
 
-        guild_key = str(guild.id) if guild else "global"
-
-        raw = f"{guild_key}:{self.map_key}:{self.server}"
-
-        identifier = hashlib.sha1(
-            raw.encode()
-        ).hexdigest()[:16]
+        guild_id = guild.id if guild else 0
 
+        # The buttons carry the session in their custom_id, so one
+        # add_dynamic_items registration serves every board message.
         self.add_item(
             AssignFlagButton(
-                f"flag_assign:{identifier}"
+                guild_id,
+                self.map_key,
+                self.server,
             )
         )
 
         self.add_item(
             ReleaseFlagButton(
-                f"flag_release:{identifier}"
+                guild_id,
+                self.map_key,
+                self.server,
             )
         )
 
-    @property
-    def session_key(self) -> str:
-        return (
-            f"{self.guild.id if self.guild else 'global'}:"
-            f"{self.map_key}:"
-            f"{self.server}"
-        )
-
-    def get_lock(self) -> asyncio.Lock:
-        lock = self._locks.get(
-            self.session_key
-        )
-
-        if lock is None:
-            lock = self._locks[
-                self.session_key
-            ] = asyncio.Lock()
-
-        return lock
-
     async def refresh_message(self) -> None:
         if not self.guild:
             return
 
-        row = await utils.get_flag_message(
+        # Bursts of clicks on one board collapse into a single edit.
+        utils.schedule_flag_refresh(
+            self.bot,
             str(self.guild.id),
             self.map_key,
             self.server,
+            view=self,
         )
 
-        if not row:
-            return
-
-        channel = self.guild.get_channel(
-            int(row["channel_id"])
-        )
-
-        if not isinstance(
-            channel,
-            discord.TextChannel,
-        ):
-            return
-
-        try:
-            message = await channel.fetch_message(
-                int(row["message_id"])
-            )
-
-            embed = await utils.create_flag_embed(
-                str(self.guild.id),
-                self.map_key,
-                self.server,
-                self.guild,
-            )
-
-            await message.edit(
-                embed=embed,
-                view=self,
-            )
-
-        except (
-            discord.NotFound,
-            discord.Forbidden,
-            discord.HTTPException,
-        ):
-            return
-
     # =====================================================
     # FACTION ROLE CHECK
     # =====================================================
@@ -127,19 +76,17 @@ class FlagManageView(discord.ui.View):
         member: discord.Member,
     ) -> bool:
 
-        return any(
-            role.name.startswith("Faction-")
-            for role in member.roles
-            if not role.is_default()
+        return utils.is_faction_member(
+            member
         )
 
     # =====================================================
     # ROLE OPTIONS
     # =====================================================
 
-    async def role_options(
+    def assignable_roles(
         self,
-    ) -> list[discord.SelectOption]:
+    ) -> list[discord.Role]:
 
         if not self.guild:
             return []
@@ -150,28 +97,10 @@ class FlagManageView(discord.ui.View):
         # The Faction- restriction is only used to determine
         # who is allowed to use the Assign Flag button.
 
-        roles = [
-            role
-            for role in self.guild.roles
-            if not role.is_default()
-            and not role.managed
-        ]
-
-        roles.sort(
-            key=lambda r: (
-                -r.position,
-                r.name.casefold(),
-            )
+        return utils.assignable_roles(
+            self.guild
         )
 
-        return [
-            discord.SelectOption(
-                label=role.name[:100],
-                value=str(role.id),
-            )
-            for role in roles[:MAX_SELECT_OPTIONS]
-        ]
-
     # =====================================================
     # ASSIGN FLAG
     # =====================================================
@@ -206,200 +135,184 @@ class FlagManageView(discord.ui.View):
                 ephemeral=True,
             )
 
-        lock = self.get_lock()
+        await interaction.response.defer(
+            ephemeral=True
+        )
 
-        if lock.locked():
-            return await interaction.response.send_message(
-                "⚠️ Another flag action is currently in progress.",
-                ephemeral=True,
-            )
+        flags = await utils.get_all_flags(
+            str(self.guild.id),
+            self.map_key,
+            self.server,
+        )
 
-        async with lock:
+        available = [
+            row
+            for row in flags
+            if row["status"] == "✅"
+            and row["role_id"] is None
+        ]
 
-            await interaction.response.defer(
-                ephemeral=True
-            )
+        if not available:
 
-            flags = await utils.get_all_flags(
-                str(self.guild.id),
-                self.map_key,
-                self.server,
+            return await interaction.followup.send(
+                "⚠️ No unclaimed flags are available.",
+                ephemeral=True,
             )
 
-            available = [
-                row
-                for row in flags
-                if row["status"] == "✅"
-                and row["role_id"] is None
+        # -------------------------------------------------
+        # FLAG SELECT
+        # -------------------------------------------------
+
+        flag_options = [
+            discord.SelectOption(
+                label=f"🟩 {row['flag']}",
+                value=row["flag"],
+            )
+            for row in available[
+                :MAX_SELECT_OPTIONS
             ]
+        ]
 
-            if not available:
+        flag_select = discord.ui.Select(
+            placeholder="Select a flag",
+            options=flag_options,
+            min_values=1,
+            max_values=1,
+        )
 
-                return await interaction.followup.send(
-                    "⚠️ No unclaimed flags are available.",
-                    ephemeral=True,
-                )
+        view = discord.ui.View(
+            timeout=60
+        )
 
-            # -------------------------------------------------
-            # FLAG SELECT
-            # -------------------------------------------------
+        view.add_item(
+            flag_select
+        )
 
-            flag_options = [
-                discord.SelectOption(
-                    label=f"🟩 {row['flag']}",
-                    value=row["flag"],
-                )
-                for row in available[
-                    :MAX_SELECT_OPTIONS
-                ]
-            ]
+        cancel = discord.ui.Button(
+            label="Cancel",
+            style=discord.ButtonStyle.secondary,
+        )
 
-            flag_select = discord.ui.Select(
-                placeholder="Select a flag",
-                options=flag_options,
-                min_values=1,
-                max_values=1,
+        async def cancel_cb(
+            inter: discord.Interaction,
+        ):
+            await inter.response.edit_message(
+                content="❌ Cancelled.",
+                view=None,
             )
 
-            view = discord.ui.View(
-                timeout=60
-            )
+        cancel.callback = cancel_cb
 
-            view.add_item(
-                flag_select
-            )
+        view.add_item(cancel)
 
-            cancel = discord.ui.Button(
-                label="Cancel",
-                style=discord.ButtonStyle.secondary,
-            )
+        # -------------------------------------------------
+        # FLAG SELECT CALLBACK
+        # -------------------------------------------------
 
-            async def cancel_cb(
-                inter: discord.Interaction,
-            ):
-                await inter.response.edit_message(
-                    content="❌ Cancelled.",
-                    view=None,
-                )
+        async def flag_cb(
+            inter: discord.Interaction,
+        ):
+
+            flag = flag_select.values[0]
 
-            cancel.callback = cancel_cb
+            if not self.assignable_roles():
 
-            view.add_item(cancel)
+                return await inter.response.edit_message(
+                    content="⚠️ No assignable roles were found.",
+                    view=None,
+                )
 
             # -------------------------------------------------
-            # FLAG SELECT CALLBACK
+            # ROLE SELECT CALLBACK
             # -------------------------------------------------
 
-            async def flag_cb(
-                inter: discord.Interaction,
+            async def role_cb(
+                inter2: discord.Interaction,
+                role: discord.Role | None,
             ):
 
-                flag = flag_select.values[0]
+                if not role:
 
-                roles = await self.role_options()
-
-                if not roles:
-
-                    return await inter.response.edit_message(
-                        content="⚠️ No assignable roles were found.",
+                    return await inter2.response.edit_message(
+                        content="⚠️ Role not found.",
                         view=None,
                     )
 
-                # -------------------------------------------------
-                # ROLE SELECT
-                #
-                # This is intentionally NOT restricted to
-                # Faction- roles anymore.
-                # -------------------------------------------------
-
-                role_select = discord.ui.Select(
-                    placeholder=f"Select a role for {flag}",
-                    options=roles,
-                )
-
-                role_view = discord.ui.View(
-                    timeout=60
-                )
-
-                role_view.add_item(
-                    role_select
-                )
-
-                # -------------------------------------------------
-                # ROLE SELECT CALLBACK
-                # -------------------------------------------------
-
-                async def role_cb(
-                    inter2: discord.Interaction,
-                ):
-
-                    role_id = int(
-                        role_select.values[0]
-                    )
-
-                    role = self.guild.get_role(
-                        role_id
-                    )
-
-                    if not role:
-
-                        return await inter2.response.edit_message(
-                            content="⚠️ Role not found.",
-                            view=None,
-                        )
+                # The claim may queue behind another action on this
+                # board, so acknowledge first to stay within the
+                # interaction deadline.
+                await inter2.response.defer()
 
+                try:
                     result = await utils.claim_flag(
                         str(self.guild.id),
                         self.map_key,
                         self.server,
                         flag,
                         str(role.id),
+                        actor_id=inter2.user.id,
+                    )
+                except asyncio.TimeoutError:
+                    return await inter2.edit_original_response(
+                        content=BUSY_MESSAGE,
+                        view=None,
                     )
 
-                    if not result:
-
-                        return await inter2.response.edit_message(
-                            content=(
-                                "⚠️ That flag was already claimed "
-                                "or is no longer available."
-                            ),
-                            view=None,
-                        )
-
-                    await self.refresh_message()
+                if not result:
 
-                    await inter2.response.edit_message(
+                    return await inter2.edit_original_response(
                         content=(
-                            f"🏴 **{flag} → {role.mention}** assigned.\n"
-                            f"🗺️ Map: **{self.map_key.title()}**\n"
-                            f"🖥️ Server: **{self.server}**"
+                            "⚠️ That flag was already claimed "
+                            "or is no longer available."
                         ),
                         view=None,
                     )
 
-                role_select.callback = role_cb
+                await self.refresh_message()
 
-                await inter.response.edit_message(
+                await inter2.edit_original_response(
                     content=(
-                        f"Choose a role for **{flag}**.\n"
+                        f"🏴 **{flag} → {role.mention}** assigned.\n"
                         f"🗺️ Map: **{self.map_key.title()}**\n"
                         f"🖥️ Server: **{self.server}**"
                     ),
-                    view=role_view,
+                    view=None,
                 )
 
-            flag_select.callback = flag_cb
+            # -------------------------------------------------
+            # ROLE PICKER
+            #
+            # Paged and searchable, so every assignable role can
+            # be picked, not only the top 25.
+            # -------------------------------------------------
 
-            await interaction.followup.send(
+            role_view = RolePickerView(
+                self.guild,
                 (
-                    "Choose a flag.\n"
+                    f"Choose a role for **{flag}**.\n"
                     f"🗺️ Map: **{self.map_key.title()}**\n"
                     f"🖥️ Server: **{self.server}**"
                 ),
-                view=view,
-                ephemeral=True,
+                role_cb,
+            )
+
+            await inter.response.edit_message(
+                content=role_view.content(),
+                view=role_view,
             )
 
+        flag_select.callback = flag_cb
+
+        await interaction.followup.send(
+            (
+                "Choose a flag.\n"
+                f"🗺️ Map: **{self.map_key.title()}**\n"
+                f"🖥️ Server: **{self.server}**"
+            ),
+            view=view,
+            ephemeral=True,
+        )
+
     # =====================================================
     # RELEASE FLAG
     # =====================================================
@@ -416,126 +329,394 @@ class FlagManageView(discord.ui.View):
                 ephemeral=True,
             )
 
-        lock = self.get_lock()
+        if not self.guild:
+            return
 
-        if lock.locked():
+        await interaction.response.defer(
+            ephemeral=True
+        )
 
-            return await interaction.response.send_message(
-                "⚠️ Another flag action is currently in progress.",
-                ephemeral=True,
-            )
+        flags = await utils.get_all_flags(
+            str(self.guild.id),
+            self.map_key,
+            self.server,
+        )
 
-        if not self.guild:
-            return
+        claimed = [
+            row
+            for row in flags
+            if row["status"] == "❌"
+            and row["role_id"]
+        ]
 
-        async with lock:
+        if not claimed:
 
-            await interaction.response.defer(
-                ephemeral=True
+            return await interaction.followup.send(
+                "⚠️ No claimed flags.",
+                ephemeral=True,
             )
 
-            flags = await utils.get_all_flags(
-                str(self.guild.id),
-                self.map_key,
-                self.server,
+        options = [
+            discord.SelectOption(
+                label=f"🟥 {row['flag']}",
+                value=row["flag"],
             )
-
-            claimed = [
-                row
-                for row in flags
-                if row["status"] == "❌"
-                and row["role_id"]
+            for row in claimed[
+                :MAX_SELECT_OPTIONS
             ]
+        ]
 
-            if not claimed:
-
-                return await interaction.followup.send(
-                    "⚠️ No claimed flags.",
-                    ephemeral=True,
-                )
-
-            options = [
-                discord.SelectOption(
-                    label=f"🟥 {row['flag']}",
-                    value=row["flag"],
-                )
-                for row in claimed[
-                    :MAX_SELECT_OPTIONS
-                ]
-            ]
+        select = discord.ui.Select(
+            placeholder="Select a claimed flag",
+            options=options,
+        )
 
-            select = discord.ui.Select(
-                placeholder="Select a claimed flag",
-                options=options,
-            )
+        view = discord.ui.View(
+            timeout=60
+        )
 
-            view = discord.ui.View(
-                timeout=60
-            )
+        view.add_item(select)
 
-            view.add_item(select)
+        async def callback(
+            inter: discord.Interaction,
+        ):
 
-            async def callback(
-                inter: discord.Interaction,
-            ):
+            flag = select.values[0]
 
-                flag = select.values[0]
+            await inter.response.defer()
 
+            try:
                 result = await utils.release_flag(
                     str(self.guild.id),
                     self.map_key,
                     self.server,
                     flag,
+                    actor_id=inter.user.id,
+                )
+            except asyncio.TimeoutError:
+                return await inter.edit_original_response(
+                    content=BUSY_MESSAGE,
+                    view=None,
                 )
 
-                if not result:
-
-                    return await inter.response.edit_message(
-                        content="⚠️ That flag is already unclaimed.",
-                        view=None,
-                    )
+            if not result:
 
-                await self.refresh_message()
-
-                await inter.response.edit_message(
-                    content=(
-                        f"🏳️ **{flag} released.**\n"
-                        f"🗺️ Map: **{self.map_key.title()}**\n"
-                        f"🖥️ Server: **{self.server}**"
-                    ),
+                return await inter.edit_original_response(
+                    content="⚠️ That flag is already unclaimed.",
                     view=None,
                 )
 
-            select.callback = callback
+            await self.refresh_message()
 
-            await interaction.followup.send(
-                (
-                    "Choose a flag to release.\n"
+            await inter.edit_original_response(
+                content=(
+                    f"🏳️ **{flag} released.**\n"
                     f"🗺️ Map: **{self.map_key.title()}**\n"
                     f"🖥️ Server: **{self.server}**"
                 ),
-                view=view,
-                ephemeral=True,
+                view=None,
             )
 
+        select.callback = callback
+
+        await interaction.followup.send(
+            (
+                "Choose a flag to release.\n"
+                f"🗺️ Map: **{self.map_key.title()}**\n"
+                f"🖥️ Server: **{self.server}**"
+            ),
+            view=view,
+            ephemeral=True,
+        )
+
+
+# =========================================================
+# ROLE PICKER
+# =========================================================
+
+class RolePickerView(discord.ui.View):
+    """Paged, searchable role select over the cached role index."""
+
+    def __init__(
+        self,
+        guild: discord.Guild,
+        header: str,
+        on_pick: Callable[
+            [discord.Interaction, discord.Role | None],
+            Awaitable[object],
+        ],
+    ):
+        super().__init__(timeout=60)
+
+        self.guild = guild
+        self.header = header
+        self.on_pick = on_pick
+        self.query = ""
+        self.page = 0
+
+        self.select = discord.ui.Select(
+            placeholder="Select a role",
+            row=0,
+        )
+        self.select.callback = self.pick
+
+        self.previous_page = discord.ui.Button(
+            label="Previous",
+            emoji="◀️",
+            style=discord.ButtonStyle.secondary,
+            row=1,
+        )
+        self.previous_page.callback = self.go_previous
+
+        self.next_page = discord.ui.Button(
+            label="Next",
+            emoji="▶️",
+            style=discord.ButtonStyle.secondary,
+            row=1,
+        )
+        self.next_page.callback = self.go_next
+
+        self.search = discord.ui.Button(
+            label="Search",
+            emoji="🔎",
+            style=discord.ButtonStyle.primary,
+            row=1,
+        )
+        self.search.callback = self.open_search
+
+        self.add_item(self.select)
+        self.add_item(self.previous_page)
+        self.add_item(self.next_page)
+        self.add_item(self.search)
+
+        self.render()
+
+    def matches(self) -> list[discord.Role]:
+        roles = utils.assignable_roles(self.guild)
+
+        if not self.query:
+            return roles
+
+        query = self.query.casefold()
+
+        return [
+            role
+            for role in roles
+            if query in role.name.casefold()
+        ]
+
+    def render(self) -> None:
+        roles = self.matches()
+
+        self.total = len(roles)
+        self.pages = max(1, -(-self.total // MAX_SELECT_OPTIONS))
+        self.page = max(0, min(self.page, self.pages - 1))
+
+        start = self.page * MAX_SELECT_OPTIONS
+        shown = roles[start:start + MAX_SELECT_OPTIONS]
+
+        if shown:
+            self.select.options = [
+                discord.SelectOption(
+                    label=role.name[:100],
+                    value=str(role.id),
+                )
+                for role in shown
+            ]
+            self.select.disabled = False
+        else:
+            # A select needs at least one option, even when disabled.
+            self.select.options = [
+                discord.SelectOption(
+                    label="No matching roles",
+                    value="none",
+                )
+            ]
+            self.select.disabled = True
+
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= self.pages - 1
+
+    def content(self) -> str:
+        lines = [
+            self.header,
+            "",
+            f"📄 Page **{self.page + 1}/{self.pages}**"
+            f"  •  **{self.total}** role(s)",
+        ]
+
+        if self.query:
+            lines.append(f"🔎 Search: `{self.query}`")
+
+        return "\n".join(lines)
+
+    async def show(
+        self,
+        interaction: discord.Interaction,
+    ) -> None:
+        self.render()
+
+        await interaction.response.edit_message(
+            content=self.content(),
+            view=self,
+        )
+
+    async def go_previous(
+        self,
+        interaction: discord.Interaction,
+    ) -> None:
+        self.page -= 1
+        await self.show(interaction)
+
+    async def go_next(
+        self,
+        interaction: discord.Interaction,
+    ) -> None:
+        self.page += 1
+        await self.show(interaction)
+
+    async def open_search(
+        self,
+        interaction: discord.Interaction,
+    ) -> None:
+        await interaction.response.send_modal(
+            RoleSearchModal(self)
+        )
+
+    async def pick(
+        self,
+        interaction: discord.Interaction,
+    ) -> None:
+        role = self.guild.get_role(
+            int(self.select.values[0])
+        )
+
+        await self.on_pick(interaction, role)
+
+
+class RoleSearchModal(
+    discord.ui.Modal,
+    title="Search roles",
+):
+
+    def __init__(
+        self,
+        picker: RolePickerView,
+    ):
+        super().__init__(timeout=60)
+
+        self.picker = picker
+
+        self.query = discord.ui.TextInput(
+            label="Role name contains",
+            placeholder="Leave empty to show every role",
+            default=picker.query or None,
+            required=False,
+            max_length=100,
+        )
+
+        self.add_item(self.query)
+
+    async def on_submit(
+        self,
+        interaction: discord.Interaction,
+    ) -> None:
+        self.picker.query = self.query.value.strip()
+        self.picker.page = 0
+
+        await self.picker.show(interaction)
+
+
+# =========================================================
+# SESSION BUTTONS
+# =========================================================
+
+# custom_id: flag_<action>:<guild_id>:<map>:<server>. Servers are
+# normalized and at most 50 characters, which keeps this within
+# Discord's 100 character custom_id limit.
+SESSION_TEMPLATE = (
+    r":(?P<guild_id>[0-9]+)"
+    r":(?P<map_key>[a-z]+)"
+    r":(?P<server>.+)"
+)
+
+
+async def session_view(
+    interaction: discord.Interaction,
+    guild_id: int,
+    map_key: str,
+    server: str,
+) -> FlagManageView | None:
+    """
+    Build a transient view for the session a button encodes.
+
+    Answers the interaction and returns None if the board is gone.
+    """
+
+    guild = interaction.guild
+
+    if (
+        guild is None
+        or guild.id != guild_id
+        or await utils.get_flag_message(
+            str(guild_id),
+            map_key,
+            server,
+        ) is None
+    ):
+        await interaction.response.send_message(
+            "❌ This flag board no longer exists.",
+            ephemeral=True,
+        )
+        return None
+
+    return FlagManageView(
+        guild,
+        map_key,
+        server,
+        interaction.client,
+    )
+
 
 # =========================================================
 # ASSIGN FLAG BUTTON
 # =========================================================
 
 class AssignFlagButton(
-    discord.ui.Button
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"flag_assign" + SESSION_TEMPLATE,
 ):
 
     def __init__(
         self,
-        custom_id: str,
+        guild_id: int,
+        map_key: str,
+        server: str,
     ):
         super().__init__(
-            label="Assign Flag",
-            emoji="🟩",
-            style=discord.ButtonStyle.success,
-            custom_id=custom_id,
+            discord.ui.Button(
+                label="Assign Flag",
+                emoji="🟩",
+                style=discord.ButtonStyle.success,
+                custom_id=f"flag_assign:{guild_id}:{map_key}:{server}",
+            )
+        )
+
+        self.guild_id = guild_id
+        self.map_key = map_key
+        self.server = server
+
+    @classmethod
+    async def from_custom_id(
+        cls,
+        interaction: discord.Interaction,
+        item: discord.ui.Button,
+        match,
+    ):
+        return cls(
+            int(match["guild_id"]),
+            match["map_key"],
+            match["server"],
         )
 
     async def callback(
@@ -543,12 +724,16 @@ class AssignFlagButton(
         interaction: discord.Interaction,
     ):
 
-        if isinstance(
-            self.view,
-            FlagManageView,
-        ):
+        view = await session_view(
+            interaction,
+            self.guild_id,
+            self.map_key,
+            self.server,
+        )
 
-            await self.view.assign_flag(
+        if view is not None:
+
+            await view.assign_flag(
                 interaction
             )
 
@@ -558,18 +743,40 @@ class AssignFlagButton(
 # =========================================================
 
 class ReleaseFlagButton(
-    discord.ui.Button
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"flag_release" + SESSION_TEMPLATE,
 ):
 
     def __init__(
         self,
-        custom_id: str,
+        guild_id: int,
+        map_key: str,
+        server: str,
     ):
         super().__init__(
-            label="Release Flag",
-            emoji="🟥",
-            style=discord.ButtonStyle.danger,
-            custom_id=custom_id,
+            discord.ui.Button(
+                label="Release Flag",
+                emoji="🟥",
+                style=discord.ButtonStyle.danger,
+                custom_id=f"flag_release:{guild_id}:{map_key}:{server}",
+            )
+        )
+
+        self.guild_id = guild_id
+        self.map_key = map_key
+        self.server = server
+
+    @classmethod
+    async def from_custom_id(
+        cls,
+        interaction: discord.Interaction,
+        item: discord.ui.Button,
+        match,
+    ):
+        return cls(
+            int(match["guild_id"]),
+            match["map_key"],
+            match["server"],
         )
 
     async def callback(
@@ -577,11 +784,15 @@ class ReleaseFlagButton(
         interaction: discord.Interaction,
     ):
 
-        if isinstance(
-            self.view,
-            FlagManageView,
-        ):
+        view = await session_view(
+            interaction,
+            self.guild_id,
+            self.map_key,
+            self.server,
+        )
+
+        if view is not None:
 
-            await self.view.release_flag(
+            await view.release_flag(
                 interaction
             )
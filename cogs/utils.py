@@ -1,15 +1,49 @@
 from __future__ import annotations
 
+import asyncio
 import contextlib
+import hashlib
+import json
+import logging
 import os
-from typing import Any, AsyncIterator, Optional
+import uuid
+import weakref
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
 
 import asyncpg
 import discord
 
 
+log = logging.getLogger("dayz-manager")
+
 db_pool: Optional[asyncpg.Pool] = None
 
+# Reported as application_name so change notifications caused by this
+# process can be told apart from those of other processes.
+INSTANCE_NAME = f"dayz-manager-{uuid.uuid4().hex[:12]}"
+
+NOTIFY_CHANNEL = "dayz_manager_changes"
+
+_listener_task: Optional[asyncio.Task] = None
+
+SessionKey = tuple[str, str, str]
+
+# Write-through flag state, keyed by (guild_id, map, server).
+# Each entry maps the canonical flag name to its latest row.
+_flag_cache: dict[SessionKey, dict[str, asyncpg.Record]] = {}
+
+# Board message handles, keyed like the flag cache. Each entry holds
+# channel_id, message_id and render_hash from flag_messages.
+_message_cache: dict[SessionKey, dict[str, Any]] = {}
+
+# guild_id -> map -> server names with a board, for autocomplete.
+# Unlike the caches above it is never dropped: sessions only grow.
+_server_index: dict[str, dict[str, set[str]]] = {}
+
+# Bumped on every write to a session so a SELECT that raced a
+# write never overwrites the newer state with what it read.
+_flag_writes: dict[SessionKey, int] = {}
+
 
 # =========================================================
 # FLAGS
@@ -50,6 +84,50 @@ FLAG_LOOKUP = {
 }
 
 
+def _build_flag_search_index() -> dict[str, list[str]]:
+    """
+    Map every casefolded substring of every flag to its matches.
+
+    Prefix matches come before other substring matches, so an
+    autocomplete lookup is a single dict access per keystroke.
+    """
+
+    prefixes: dict[str, list[str]] = {}
+    infixes: dict[str, list[str]] = {}
+
+    for flag in sorted(FLAGS, key=str.casefold):
+        name = flag.casefold()
+        seen: set[str] = set()
+
+        for start in range(len(name)):
+            for end in range(start + 1, len(name) + 1):
+                part = name[start:end]
+
+                if part in seen:
+                    continue
+
+                seen.add(part)
+
+                target = prefixes if start == 0 else infixes
+                target.setdefault(part, []).append(flag)
+
+    index = {
+        part: prefixes.get(part, []) + [
+            flag
+            for flag in infixes.get(part, [])
+            if flag not in prefixes.get(part, [])
+        ]
+        for part in prefixes.keys() | infixes.keys()
+    }
+
+    index[""] = sorted(FLAGS, key=str.casefold)
+
+    return index
+
+
+FLAG_SEARCH_INDEX = _build_flag_search_index()
+
+
 # =========================================================
 # MAP DATA
 # =========================================================
@@ -81,6 +159,10 @@ EMBED_COLOR = 0x3498DB
 CLAIMED_EMOJI = "🟥"
 AVAILABLE_EMOJI = "🟩"
 
+# Bump whenever the board's components or layout change in a way the
+# embed content alone would not reveal, so every board is re-published.
+BOARD_LAYOUT_VERSION = 2
+
 
 # =========================================================
 # NORMALIZATION
@@ -100,6 +182,13 @@ def normalize_map(value: str) -> str:
     return aliases.get(value, value)
 
 
+def search_flags(value: str) -> list[str]:
+    return FLAG_SEARCH_INDEX.get(
+        str(value or "").strip().casefold(),
+        [],
+    )
+
+
 def normalize_flag(value: str) -> Optional[str]:
     if not value:
         return None
@@ -137,20 +226,23 @@ def channel_name_for(
     return safe.strip("-")[:100] or "flags"
 
 
+def session_key(
+    guild_id: str,
+    map_key: str,
+    server: str,
+) -> SessionKey:
+    return (
+        str(guild_id),
+        normalize_map(map_key),
+        normalize_server(server),
+    )
+
+
 # =========================================================
 # DATABASE CONNECTION
 # =========================================================
 
-async def ensure_connection() -> asyncpg.Pool:
-    global db_pool
-
-    if db_pool is not None:
-        try:
-            if not db_pool._closed:
-                return db_pool
-        except AttributeError:
-            pass
-
+def database_dsn() -> str:
     dsn = os.getenv("DATABASE_URL")
 
     if not dsn:
@@ -161,14 +253,30 @@ async def ensure_connection() -> asyncpg.Pool:
     if dsn.startswith("postgres://"):
         dsn = "postgresql://" + dsn[len("postgres://"):]
 
+    return dsn
+
+
+async def ensure_connection() -> asyncpg.Pool:
+    global db_pool
+
+    if db_pool is not None:
+        try:
+            if not db_pool._closed:
+                return db_pool
+        except AttributeError:
+            pass
+
     db_pool = await asyncpg.create_pool(
-        dsn=dsn,
+        dsn=database_dsn(),
         min_size=1,
         max_size=int(
             os.getenv("DB_MAX_POOL_SIZE", "10")
         ),
         command_timeout=30,
         max_inactive_connection_lifetime=300,
+        server_settings={
+            "application_name": INSTANCE_NAME,
+        },
     )
 
     async with db_pool.acquire() as conn:
@@ -177,9 +285,42 @@ async def ensure_connection() -> asyncpg.Pool:
     return db_pool
 
 
-async def migrate(
+@contextlib.asynccontextmanager
+async def safe_acquire() -> AsyncIterator[asyncpg.Connection]:
+
+    pool = await ensure_connection()
+
+    async with pool.acquire() as conn:
+        yield conn
+
+
+async def close_db() -> None:
+    global db_pool
+
+    await flag_events.close()
+    await stop_listener()
+
+    if db_pool is not None:
+        await db_pool.close()
+        db_pool = None
+
+    invalidate_flag_cache()
+    _message_cache.clear()
+
+
+# =========================================================
+# SCHEMA MIGRATIONS
+# =========================================================
+
+# Arbitrary key for pg_advisory_xact_lock so only one process
+# applies migrations at a time during rolling restarts.
+MIGRATION_LOCK_ID = 0x44415A4D
+
+
+async def _migration_001_baseline(
     conn: asyncpg.Connection,
 ) -> None:
+    """Tables and indexes as they existed before versioned migrations."""
 
     await conn.execute("""
         CREATE TABLE IF NOT EXISTS flags (
@@ -281,197 +422,1183 @@ async def migrate(
     """)
 
 
-@contextlib.asynccontextmanager
-async def safe_acquire() -> AsyncIterator[asyncpg.Connection]:
+async def _migration_002_render_hash(
+    conn: asyncpg.Connection,
+) -> None:
+    await conn.execute("""
+        ALTER TABLE flag_messages
+        ADD COLUMN IF NOT EXISTS render_hash TEXT
+    """)
 
-    pool = await ensure_connection()
 
-    async with pool.acquire() as conn:
-        yield conn
+async def _migration_003_compact_flags(
+    conn: asyncpg.Connection,
+) -> None:
+    """
+    Native BIGINT snowflakes, a SMALLINT flag lookup table and a
+    boolean claimed column in place of TEXT ids and emoji status.
+    """
 
+    await conn.execute("""
+        CREATE TABLE flag_names (
+            flag_id SMALLINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        )
+    """)
 
-async def close_db() -> None:
-    global db_pool
+    await conn.execute("""
+        INSERT INTO flag_names (name)
+        SELECT name
+        FROM unnest($1::text[]) WITH ORDINALITY AS seed (name, position)
+        ORDER BY position
+    """,
+        FLAGS,
+    )
 
-    if db_pool is not None:
-        await db_pool.close()
-        db_pool = None
+    # Keep rows for any flag that has since been dropped from FLAGS.
+    await conn.execute("""
+        INSERT INTO flag_names (name)
+        SELECT DISTINCT flag
+        FROM flags
+        WHERE flag NOT IN (
+            SELECT name
+            FROM flag_names
+        )
+    """)
 
+    await conn.execute("""
+        CREATE TABLE flags_compact (
+            guild_id BIGINT NOT NULL,
+            map TEXT NOT NULL,
+            server TEXT NOT NULL DEFAULT 'server 1',
+            flag_id SMALLINT NOT NULL REFERENCES flag_names (flag_id),
+            claimed BOOLEAN NOT NULL DEFAULT FALSE,
+            role_id BIGINT,
+            PRIMARY KEY (guild_id, map, server, flag_id)
+        )
+    """)
 
-# =========================================================
-# FLAG DATABASE OPERATIONS
-# =========================================================
+    await conn.execute("""
+        INSERT INTO flags_compact (
+            guild_id,
+            map,
+            server,
+            flag_id,
+            claimed,
+            role_id
+        )
+        SELECT
+            f.guild_id::bigint,
+            f.map,
+            f.server,
+            n.flag_id,
+            f.status='❌' OR f.role_id IS NOT NULL,
+            NULLIF(f.role_id, '')::bigint
+        FROM flags f
+        JOIN flag_names n
+          ON n.name=f.flag
+    """)
 
-async def get_flag(
-    guild_id: str,
-    map_key: str,
-    server: str,
-    flag: str,
-):
-    canonical = normalize_flag(flag)
+    await conn.execute("DROP TABLE flags")
 
-    if not canonical:
-        return None
+    await conn.execute(
+        "ALTER TABLE flags_compact RENAME TO flags"
+    )
 
-    async with safe_acquire() as conn:
+    await conn.execute(
+        "ALTER INDEX flags_compact_pkey RENAME TO flags_pkey"
+    )
 
-        return await conn.fetchrow("""
-            SELECT
-                guild_id,
-                map,
-                server,
-                flag,
-                status,
-                role_id
-            FROM flags
-            WHERE guild_id=$1
-              AND map=$2
-              AND server=$3
-              AND flag=$4
-        """,
-            str(guild_id),
-            normalize_map(map_key),
-            normalize_server(server),
-            canonical,
-        )
+    # idx_flags_lookup went with the old table. The primary key
+    # leads with (guild_id, map, server), so it serves those scans.
 
+    await conn.execute("""
+        ALTER TABLE flag_messages
+            ALTER COLUMN guild_id TYPE BIGINT USING guild_id::bigint,
+            ALTER COLUMN channel_id TYPE BIGINT USING channel_id::bigint,
+            ALTER COLUMN message_id TYPE BIGINT USING message_id::bigint,
+            ALTER COLUMN log_channel_id TYPE BIGINT
+                USING NULLIF(log_channel_id, '')::bigint
+    """)
 
-async def get_all_flags(
-    guild_id: str,
-    map_key: str,
-    server: str,
-):
-    async with safe_acquire() as conn:
 
-        return await conn.fetch("""
-            SELECT
-                guild_id,
-                map,
-                server,
-                flag,
-                status,
-                role_id
-            FROM flags
-            WHERE guild_id=$1
-              AND map=$2
-              AND server=$3
-            ORDER BY flag ASC
-        """,
-            str(guild_id),
-            normalize_map(map_key),
-            normalize_server(server),
-        )
+async def _migration_004_change_notify(
+    conn: asyncpg.Connection,
+) -> None:
+    """
+    NOTIFY on every change to flags and flag_messages.
+
+    The payload names the session and the writer's application_name.
+    Identical payloads within one transaction are merged by Postgres,
+    so a batch update of one board produces a single notification.
+    """
+
+    await conn.execute(f"""
+        CREATE OR REPLACE FUNCTION notify_flag_change()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            source RECORD;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                source := OLD;
+            ELSE
+                source := NEW;
+            END IF;
+
+            PERFORM pg_notify(
+                '{NOTIFY_CHANNEL}',
+                json_build_object(
+                    'table', TG_TABLE_NAME,
+                    'guild_id', source.guild_id::text,
+                    'map', source.map,
+                    'server', source.server,
+                    'origin', current_setting('application_name', true)
+                )::text
+            );
+
+            RETURN NULL;
+        END;
+        $$
+    """)
 
+    for table in ("flags", "flag_messages"):
+        await conn.execute(f"""
+            CREATE TRIGGER {table}_notify
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW
+            EXECUTE FUNCTION notify_flag_change()
+        """)
 
-async def initialize_flags(
-    guild_id: str,
-    map_key: str,
-    server: str,
-) -> None:
 
-    async with safe_acquire() as conn:
+async def _migration_005_flag_activity(
+    conn: asyncpg.Connection,
+) -> None:
+    await conn.execute("""
+        ALTER TABLE flags
+        ADD COLUMN updated_at TIMESTAMPTZ
+    """)
 
-        await conn.executemany("""
-            INSERT INTO flags (
-                guild_id,
-                map,
-                server,
-                flag,
-                status,
-                role_id
-            )
-            VALUES (
-                $1,
-                $2,
-                $3,
-                $4,
-                '✅',
-                NULL
-            )
-            ON CONFLICT (
-                guild_id,
-                map,
-                server,
-                flag
-            )
-            DO NOTHING
-        """, [
-            (
-                str(guild_id),
-                normalize_map(map_key),
-                normalize_server(server),
-                flag,
-            )
-            for flag in FLAGS
-        ])
 
+async def _migration_006_restart_configs(
+    conn: asyncpg.Connection,
+) -> None:
+    await conn.execute("""
+        CREATE TABLE restart_configs (
+            guild_id BIGINT PRIMARY KEY,
+            interval SMALLINT NOT NULL,
+            restart_time TEXT NOT NULL,
+            timezone TEXT NOT NULL,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """)
 
-async def claim_flag(
-    guild_id: str,
-    map_key: str,
-    server: str,
-    flag: str,
-    role_id: str,
-):
-    canonical = normalize_flag(flag)
 
-    if not canonical:
-        return None
+async def _migration_007_restart_warnings(
+    conn: asyncpg.Connection,
+) -> None:
+    await conn.execute("""
+        ALTER TABLE restart_configs
+        ADD COLUMN warning_channel_id BIGINT
+    """)
 
-    async with safe_acquire() as conn:
 
-        return await conn.fetchrow("""
-            UPDATE flags
-            SET
-                status='❌',
-                role_id=$5
-            WHERE guild_id=$1
-              AND map=$2
-              AND server=$3
-              AND flag=$4
-              AND status='✅'
-              AND role_id IS NULL
-            RETURNING *
-        """,
-            str(guild_id),
-            normalize_map(map_key),
-            normalize_server(server),
-            canonical,
-            str(role_id),
+async def _migration_008_reminders(
+    conn: asyncpg.Connection,
+) -> None:
+    await conn.execute("""
+        CREATE TABLE reminders (
+            reminder_id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+            guild_id BIGINT,
+            channel_id BIGINT NOT NULL,
+            user_id BIGINT NOT NULL,
+            message TEXT NOT NULL,
+            label TEXT NOT NULL,
+            due_at TIMESTAMPTZ NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now()
         )
+    """)
+
+    await conn.execute("""
+        CREATE INDEX idx_reminders_due
+        ON reminders (due_at)
+    """)
 
+    await conn.execute("""
+        CREATE INDEX idx_reminders_user
+        ON reminders (user_id, due_at)
+    """)
 
-async def release_flag(
-    guild_id: str,
-    map_key: str,
-    server: str,
-    flag: str,
-):
-    canonical = normalize_flag(flag)
 
-    if not canonical:
-        return None
+async def _migration_009_role_holdings(
+    conn: asyncpg.Connection,
+) -> None:
+    # Reverse lookup for "which flags does this role hold".
+    await conn.execute("""
+        CREATE INDEX idx_flags_role
+        ON flags (guild_id, role_id)
+        WHERE role_id IS NOT NULL
+    """)
 
-    async with safe_acquire() as conn:
 
-        return await conn.fetchrow("""
-            UPDATE flags
-            SET
-                status='✅',
-                role_id=NULL
-            WHERE guild_id=$1
-              AND map=$2
-              AND server=$3
-              AND flag=$4
-              AND status='❌'
-              AND role_id IS NOT NULL
-            RETURNING *
-        """,
-            str(guild_id),
-            normalize_map(map_key),
-            normalize_server(server),
-            canonical,
+async def _migration_010_flag_events(
+    conn: asyncpg.Connection,
+) -> None:
+    # Append-only claim/release history. Flag names are stored as
+    # text so history survives changes to flag_names.
+    await conn.execute("""
+        CREATE TABLE flag_events (
+            event_id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+            guild_id BIGINT NOT NULL,
+            map TEXT NOT NULL,
+            server TEXT NOT NULL,
+            flag TEXT NOT NULL,
+            action TEXT NOT NULL
+                CHECK (action IN ('claim', 'release')),
+            role_id BIGINT,
+            actor_id BIGINT,
+            occurred_at TIMESTAMPTZ NOT NULL
         )
+    """)
+
+    await conn.execute("""
+        CREATE INDEX idx_flag_events_session
+        ON flag_events (guild_id, map, server, occurred_at)
+    """)
+
+    await conn.execute("""
+        CREATE INDEX idx_flag_events_role
+        ON flag_events (guild_id, role_id, occurred_at)
+    """)
+
+
+async def _migration_011_reminder_claims(
+    conn: asyncpg.Connection,
+) -> None:
+    # A delivery claims a reminder for a while instead of deleting it
+    # up front; the row is removed once the message has been sent.
+    await conn.execute("""
+        ALTER TABLE reminders
+        ADD COLUMN claimed_until TIMESTAMPTZ,
+        ADD COLUMN attempts SMALLINT NOT NULL DEFAULT 0
+    """)
+
+
+# Ordered registry: (version, description, step). Append only;
+# never edit or reorder a step that has shipped.
+MIGRATIONS: list[
+    tuple[int, str, Callable[[asyncpg.Connection], Awaitable[None]]]
+] = [
+    (1, "baseline flags and flag_messages", _migration_001_baseline),
+    (2, "flag_messages.render_hash", _migration_002_render_hash),
+    (3, "compact flags schema", _migration_003_compact_flags),
+    (4, "change notification triggers", _migration_004_change_notify),
+    (5, "flags.updated_at", _migration_005_flag_activity),
+    (6, "restart_configs", _migration_006_restart_configs),
+    (7, "restart_configs.warning_channel_id", _migration_007_restart_warnings),
+    (8, "reminders", _migration_008_reminders),
+    (9, "flags role holdings index", _migration_009_role_holdings),
+    (10, "flag_events", _migration_010_flag_events),
+    (11, "reminders delivery claims", _migration_011_reminder_claims),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+async def migrate(
+    conn: asyncpg.Connection,
+) -> None:
+
+    # Fast path: a single query when the schema is already current.
+    try:
+        current = await conn.fetchval(
+            "SELECT MAX(version) FROM schema_version"
+        )
+    except asyncpg.UndefinedTableError:
+        current = None
+
+    if current is not None and current >= SCHEMA_VERSION:
+        if current > SCHEMA_VERSION:
+            log.warning(
+                "Database schema version %s is newer than this build (%s).",
+                current,
+                SCHEMA_VERSION,
+            )
+        return
+
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """)
+
+    for version, description, step in MIGRATIONS:
+
+        if current is not None and version <= current:
+            continue
+
+        async with conn.transaction():
+
+            await conn.execute(
+                "SELECT pg_advisory_xact_lock($1)",
+                MIGRATION_LOCK_ID,
+            )
+
+            # Another process may have applied it while we waited.
+            applied = await conn.fetchval(
+                "SELECT 1 FROM schema_version WHERE version=$1",
+                version,
+            )
+
+            if applied:
+                continue
+
+            await step(conn)
+
+            await conn.execute("""
+                INSERT INTO schema_version (
+                    version,
+                    description
+                )
+                VALUES ($1, $2)
+            """,
+                version,
+                description,
+            )
+
+        log.info(
+            "Applied schema migration %d: %s",
+            version,
+            description,
+        )
+
+
+# =========================================================
+# CHANGE NOTIFICATIONS
+# =========================================================
+
+LISTENER_HEALTH_CHECK_SECONDS = 60
+
+
+async def start_listener(
+    bot: discord.Client,
+) -> None:
+    """
+    Follow changes made by other processes through LISTEN/NOTIFY.
+
+    Runs on a dedicated connection outside the pool. Notifications
+    invalidate the affected session's caches and queue a board refresh.
+    """
+
+    global _listener_task
+
+    if _listener_task is None or _listener_task.done():
+        _listener_task = asyncio.create_task(
+            _listen(bot)
+        )
+
+
+async def stop_listener() -> None:
+    global _listener_task
+
+    task, _listener_task = _listener_task, None
+
+    if task is not None:
+        task.cancel()
+
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+
+def _on_notification(
+    bot: discord.Client,
+    payload: str,
+) -> None:
+
+    try:
+        data = json.loads(payload)
+        key = session_key(
+            data["guild_id"],
+            data["map"],
+            data["server"],
+        )
+    except (ValueError, KeyError, TypeError):
+        log.warning("Ignoring malformed change notification: %r", payload)
+        return
+
+    # Our own writes have already updated our caches.
+    if data.get("origin") == INSTANCE_NAME:
+        return
+
+    invalidate_flag_message(*key)
+
+    if data.get("table") == "flags":
+        invalidate_flag_cache(*key)
+        schedule_flag_refresh(bot, *key)
+
+
+async def _listen(
+    bot: discord.Client,
+) -> None:
+
+    delay = 1
+    connected_before = False
+
+    while True:
+        try:
+            conn = await asyncpg.connect(
+                dsn=database_dsn(),
+                server_settings={
+                    "application_name": f"{INSTANCE_NAME}-listener",
+                },
+            )
+        except Exception:
+            log.exception(
+                "Change listener connection failed; retrying in %ds.",
+                delay,
+            )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 60)
+            continue
+
+        lost = asyncio.Event()
+
+        try:
+            conn.add_termination_listener(
+                lambda _conn: lost.set()
+            )
+
+            await conn.add_listener(
+                NOTIFY_CHANNEL,
+                lambda _conn, _pid, _channel, payload: _on_notification(
+                    bot,
+                    payload,
+                ),
+            )
+
+            # Anything written while we were not listening is unknown.
+            if connected_before:
+                invalidate_flag_cache()
+                _message_cache.clear()
+
+            connected_before = True
+            delay = 1
+
+            log.info("Listening for flag changes on %s.", NOTIFY_CHANNEL)
+
+            while not lost.is_set():
+                try:
+                    await asyncio.wait_for(
+                        lost.wait(),
+                        timeout=LISTENER_HEALTH_CHECK_SECONDS,
+                    )
+                except asyncio.TimeoutError:
+                    # Detects half-open connections that never close.
+                    await conn.execute("SELECT 1")
+
+        except asyncio.CancelledError:
+            raise
+
+        except Exception:
+            log.exception("Change listener connection lost.")
+
+        finally:
+            if not conn.is_closed():
+                with contextlib.suppress(Exception):
+                    await conn.close(timeout=5)
+
+        log.warning("Change listener disconnected; reconnecting.")
+
+        invalidate_flag_cache()
+        _message_cache.clear()
+
+
+# =========================================================
+# FLAG STATE CACHE
+# =========================================================
+
+def _cache_session(
+    key: SessionKey,
+    rows,
+) -> None:
+    _flag_cache[key] = {
+        row["flag"]: row
+        for row in rows
+    }
+
+
+def _cache_flag_row(row) -> None:
+    key = session_key(
+        row["guild_id"],
+        row["map"],
+        row["server"],
+    )
+
+    _flag_writes[key] = _flag_writes.get(key, 0) + 1
+
+    cached = _flag_cache.get(key)
+
+    # Only patch sessions that are already fully loaded, otherwise
+    # a later read would mistake a partial entry for the whole board.
+    if cached is not None:
+        cached[row["flag"]] = row
+
+
+def _cached_rows(key: SessionKey):
+    cached = _flag_cache.get(key)
+
+    if cached is None:
+        return None
+
+    return [
+        cached[flag]
+        for flag in sorted(cached)
+    ]
+
+
+def invalidate_flag_cache(
+    guild_id: Optional[str] = None,
+    map_key: Optional[str] = None,
+    server: Optional[str] = None,
+) -> None:
+    """
+    Drop cached flag state.
+
+    With no arguments every session is dropped; with only a guild
+    every session of that guild is dropped.
+    """
+
+    if guild_id is None:
+        keys = list(_flag_cache)
+    elif map_key is not None and server is not None:
+        keys = [session_key(guild_id, map_key, server)]
+    else:
+        keys = [
+            key
+            for key in _flag_cache
+            if key[0] == str(guild_id)
+        ]
+
+    for key in keys:
+        _flag_cache.pop(key, None)
+        _flag_writes[key] = _flag_writes.get(key, 0) + 1
+
+
+# =========================================================
+# SESSION LOCKS
+# =========================================================
+
+SESSION_LOCK_TIMEOUT = 5.0
+
+# Per-session locks for this process. Entries disappear on their own
+# once no coroutine holds or waits on the lock.
+_session_locks: weakref.WeakValueDictionary[
+    SessionKey, asyncio.Lock
+] = weakref.WeakValueDictionary()
+
+
+def _advisory_key(key: SessionKey) -> int:
+    digest = hashlib.blake2b(
+        ":".join(key).encode(),
+        digest_size=8,
+    ).digest()
+
+    return int.from_bytes(digest, "big", signed=True)
+
+
+@contextlib.asynccontextmanager
+async def session_lock(
+    guild_id: str,
+    map_key: str,
+    server: str,
+    timeout: float = SESSION_LOCK_TIMEOUT,
+) -> AsyncIterator[asyncpg.Connection]:
+    """
+    Serialise writes to one session across coroutines and processes.
+
+    Waiters in this process queue on an asyncio.Lock, so they do not
+    tie up pool connections; across processes the yielded connection
+    holds pg_advisory_xact_lock until its transaction ends. Raises
+    asyncio.TimeoutError if the session stays busy for `timeout`.
+    """
+
+    key = session_key(guild_id, map_key, server)
+
+    lock = _session_locks.get(key)
+
+    if lock is None:
+        lock = _session_locks[key] = asyncio.Lock()
+
+    await asyncio.wait_for(
+        lock.acquire(),
+        timeout=timeout,
+    )
+
+    try:
+        async with safe_acquire() as conn:
+            async with conn.transaction():
+
+                # One round trip for both statements; the values are
+                # computed here, never taken from user input.
+                try:
+                    await conn.execute(
+                        f"SET LOCAL lock_timeout = '{int(timeout * 1000)}ms';"
+                        f"SELECT pg_advisory_xact_lock({_advisory_key(key)})"
+                    )
+                except asyncpg.LockNotAvailableError as exc:
+                    raise asyncio.TimeoutError(
+                        f"Flag session {key} is busy."
+                    ) from exc
+
+                yield conn
+
+    finally:
+        lock.release()
+
+
+# =========================================================
+# FLAG DATABASE OPERATIONS
+# =========================================================
+
+# Compatibility projection over the compact schema. Rows keep the
+# legacy shape callers rely on: string snowflakes, the flag name and
+# the '✅'/'❌' status. Expects flags aliased as f, flag_names as n.
+FLAG_ROW_COLUMNS = """
+    f.guild_id::text AS guild_id,
+    f.map,
+    f.server,
+    n.name AS flag,
+    CASE WHEN f.claimed THEN '❌' ELSE '✅' END AS status,
+    f.role_id::text AS role_id
+"""
+
+
+async def get_flag(
+    guild_id: str,
+    map_key: str,
+    server: str,
+    flag: str,
+):
+    canonical = normalize_flag(flag)
+
+    if not canonical:
+        return None
+
+    cached = _flag_cache.get(
+        session_key(guild_id, map_key, server)
+    )
+
+    if cached is not None:
+        return cached.get(canonical)
+
+    async with safe_acquire() as conn:
+
+        return await conn.fetchrow(f"""
+            SELECT {FLAG_ROW_COLUMNS}
+            FROM flags f
+            JOIN flag_names n
+              ON n.flag_id=f.flag_id
+            WHERE f.guild_id=$1
+              AND f.map=$2
+              AND f.server=$3
+              AND n.name=$4
+        """,
+            int(guild_id),
+            normalize_map(map_key),
+            normalize_server(server),
+            canonical,
+        )
+
+
+async def get_all_flags(
+    guild_id: str,
+    map_key: str,
+    server: str,
+):
+    key = session_key(guild_id, map_key, server)
+
+    cached = _cached_rows(key)
+
+    if cached is not None:
+        return cached
+
+    writes = _flag_writes.get(key, 0)
+
+    async with safe_acquire() as conn:
+
+        rows = await conn.fetch(f"""
+            SELECT {FLAG_ROW_COLUMNS}
+            FROM flags f
+            JOIN flag_names n
+              ON n.flag_id=f.flag_id
+            WHERE f.guild_id=$1
+              AND f.map=$2
+              AND f.server=$3
+            ORDER BY n.name ASC
+        """,
+            int(guild_id),
+            key[1],
+            key[2],
+        )
+
+    if _flag_writes.get(key, 0) == writes:
+        _cache_session(key, rows)
+
+    return rows
+
+
+async def get_flag_holdings_by_roles(
+    guild_id: str,
+    role_ids: list[int],
+) -> dict[str, list[asyncpg.Record]]:
+    """
+    Flags held by each role across every map and server.
+
+    Returns role_id -> rows of (map, server, flags), one row per
+    session, from a single grouped query.
+    """
+
+    if not role_ids:
+        return {}
+
+    async with safe_acquire() as conn:
+
+        rows = await conn.fetch("""
+            SELECT
+                f.role_id::text AS role_id,
+                f.map,
+                f.server,
+                array_agg(n.name ORDER BY n.name) AS flags
+            FROM flags f
+            JOIN flag_names n
+              ON n.flag_id=f.flag_id
+            WHERE f.guild_id=$1
+              AND f.role_id = ANY($2::bigint[])
+            GROUP BY f.role_id, f.map, f.server
+            ORDER BY f.map, f.server
+        """,
+            int(guild_id),
+            [int(role_id) for role_id in role_ids],
+        )
+
+    holdings: dict[str, list[asyncpg.Record]] = {}
+
+    for row in rows:
+        holdings.setdefault(
+            row["role_id"],
+            [],
+        ).append(row)
+
+    return holdings
+
+
+async def get_role_holdings(
+    guild_id: str,
+    role_id: int,
+) -> list[asyncpg.Record]:
+    """Flags one role holds across every map and server."""
+
+    holdings = await get_flag_holdings_by_roles(
+        guild_id,
+        [role_id],
+    )
+
+    return holdings.get(str(role_id), [])
+
+
+async def initialize_flags(
+    guild_id: str,
+    map_key: str,
+    server: str,
+) -> None:
+
+    key = session_key(guild_id, map_key, server)
+
+    writes = _flag_writes.get(key, 0)
+
+    async with safe_acquire() as conn:
+
+        # Register flags added to FLAGS since the last setup. Filtering
+        # first keeps ON CONFLICT from burning SMALLINT identity values.
+        await conn.execute("""
+            INSERT INTO flag_names (name)
+            SELECT seed.name
+            FROM unnest($1::text[]) AS seed (name)
+            WHERE NOT EXISTS (
+                SELECT 1
+                FROM flag_names existing
+                WHERE existing.name=seed.name
+            )
+            ON CONFLICT (name)
+            DO NOTHING
+        """,
+            FLAGS,
+        )
+
+        # Existing rows and newly inserted rows are returned together,
+        # so the whole board can be cached from this one statement.
+        rows = await conn.fetch(f"""
+            WITH inserted AS (
+                INSERT INTO flags (
+                    guild_id,
+                    map,
+                    server,
+                    flag_id
+                )
+                SELECT
+                    $1,
+                    $2,
+                    $3,
+                    flag_id
+                FROM flag_names
+                WHERE name = ANY($4::text[])
+                ON CONFLICT (
+                    guild_id,
+                    map,
+                    server,
+                    flag_id
+                )
+                DO NOTHING
+                RETURNING *
+            ),
+            board AS (
+                SELECT *
+                FROM flags
+                WHERE guild_id=$1
+                  AND map=$2
+                  AND server=$3
+
+                UNION ALL
+
+                SELECT *
+                FROM inserted
+            )
+            SELECT {FLAG_ROW_COLUMNS}
+            FROM board f
+            JOIN flag_names n
+              ON n.flag_id=f.flag_id
+        """,
+            int(guild_id),
+            key[1],
+            key[2],
+            FLAGS,
+        )
+
+    # A claim or release that landed meanwhile is newer than these
+    # rows; drop the entry and let the next read reload it.
+    if _flag_writes.get(key, 0) == writes:
+        _flag_writes[key] = writes + 1
+        _cache_session(key, rows)
+    else:
+        invalidate_flag_cache(guild_id, map_key, server)
+
+
+async def claim_flag(
+    guild_id: str,
+    map_key: str,
+    server: str,
+    flag: str,
+    role_id: str,
+    actor_id: Optional[int] = None,
+):
+    canonical = normalize_flag(flag)
+
+    if not canonical:
+        return None
+
+    async with session_lock(guild_id, map_key, server) as conn:
+
+        row = await conn.fetchrow(f"""
+            UPDATE flags f
+            SET
+                claimed=TRUE,
+                role_id=$5,
+                updated_at=now()
+            FROM flag_names n
+            WHERE n.flag_id=f.flag_id
+              AND f.guild_id=$1
+              AND f.map=$2
+              AND f.server=$3
+              AND n.name=$4
+              AND NOT f.claimed
+              AND f.role_id IS NULL
+            RETURNING {FLAG_ROW_COLUMNS}
+        """,
+            int(guild_id),
+            normalize_map(map_key),
+            normalize_server(server),
+            canonical,
+            int(role_id),
+        )
+
+    _apply_flag_update(guild_id, map_key, server, row)
+
+    if row is not None:
+        flag_events.record("claim", [row], actor_id)
+
+    return row
+
+
+async def release_flag(
+    guild_id: str,
+    map_key: str,
+    server: str,
+    flag: str,
+    actor_id: Optional[int] = None,
+):
+    canonical = normalize_flag(flag)
+
+    if not canonical:
+        return None
+
+    async with session_lock(guild_id, map_key, server) as conn:
+
+        row = await conn.fetchrow(f"""
+            UPDATE flags f
+            SET
+                claimed=FALSE,
+                role_id=NULL,
+                updated_at=now()
+            FROM flag_names n, flags old
+            WHERE n.flag_id=f.flag_id
+              AND old.guild_id=f.guild_id
+              AND old.map=f.map
+              AND old.server=f.server
+              AND old.flag_id=f.flag_id
+              AND f.guild_id=$1
+              AND f.map=$2
+              AND f.server=$3
+              AND n.name=$4
+              AND f.claimed
+              AND f.role_id IS NOT NULL
+            RETURNING
+                {FLAG_ROW_COLUMNS},
+                old.role_id::text AS released_role_id
+        """,
+            int(guild_id),
+            normalize_map(map_key),
+            normalize_server(server),
+            canonical,
+        )
+
+    _apply_flag_update(guild_id, map_key, server, row)
+
+    if row is not None:
+        flag_events.record("release", [row], actor_id)
+
+    return row
+
+
+async def claim_flags(
+    guild_id: str,
+    map_key: str,
+    server: str,
+    flags: list[str],
+    role_id: str,
+    actor_id: Optional[int] = None,
+) -> dict[str, Any]:
+    """
+    Claim several flags for one role with a single UPDATE.
+
+    Returns every requested flag mapped to its updated row, or to None
+    when it is unknown, already claimed or missing from this setup.
+    Valid flags are keyed by canonical name, invalid ones as given.
+    """
+
+    outcomes, canonical = _batch_outcomes(flags)
+
+    if not canonical:
+        return outcomes
+
+    async with session_lock(guild_id, map_key, server) as conn:
+
+        rows = await conn.fetch(f"""
+            UPDATE flags f
+            SET
+                claimed=TRUE,
+                role_id=$5,
+                updated_at=now()
+            FROM flag_names n
+            WHERE n.flag_id=f.flag_id
+              AND f.guild_id=$1
+              AND f.map=$2
+              AND f.server=$3
+              AND n.name = ANY($4::text[])
+              AND NOT f.claimed
+              AND f.role_id IS NULL
+            RETURNING {FLAG_ROW_COLUMNS}
+        """,
+            int(guild_id),
+            normalize_map(map_key),
+            normalize_server(server),
+            canonical,
+            int(role_id),
+        )
+
+    _apply_batch_update(
+        guild_id,
+        map_key,
+        server,
+        rows,
+        outcomes,
+        len(canonical),
+    )
+
+    flag_events.record("claim", rows, actor_id)
+
+    return outcomes
+
+
+async def release_flags(
+    guild_id: str,
+    map_key: str,
+    server: str,
+    flags: list[str],
+    actor_id: Optional[int] = None,
+) -> dict[str, Any]:
+    """Release several flags with a single UPDATE; see claim_flags."""
+
+    outcomes, canonical = _batch_outcomes(flags)
+
+    if not canonical:
+        return outcomes
+
+    async with session_lock(guild_id, map_key, server) as conn:
+
+        rows = await conn.fetch(f"""
+            UPDATE flags f
+            SET
+                claimed=FALSE,
+                role_id=NULL,
+                updated_at=now()
+            FROM flag_names n, flags old
+            WHERE n.flag_id=f.flag_id
+              AND old.guild_id=f.guild_id
+              AND old.map=f.map
+              AND old.server=f.server
+              AND old.flag_id=f.flag_id
+              AND f.guild_id=$1
+              AND f.map=$2
+              AND f.server=$3
+              AND n.name = ANY($4::text[])
+              AND f.claimed
+              AND f.role_id IS NOT NULL
+            RETURNING
+                {FLAG_ROW_COLUMNS},
+                old.role_id::text AS released_role_id
+        """,
+            int(guild_id),
+            normalize_map(map_key),
+            normalize_server(server),
+            canonical,
+        )
+
+    _apply_batch_update(
+        guild_id,
+        map_key,
+        server,
+        rows,
+        outcomes,
+        len(canonical),
+    )
+
+    flag_events.record("release", rows, actor_id)
+
+    return outcomes
+
+
+async def release_role_flags(
+    guild_id: str,
+    role_id: int,
+) -> list[asyncpg.Record]:
+    """
+    Release every flag a role holds, across all sessions of a guild.
+
+    Used when the role is deleted. No session locks are taken: the
+    UPDATE only touches rows still held by this role, which nothing
+    else can claim while they are held.
+    """
+
+    async with safe_acquire() as conn:
+
+        rows = await conn.fetch(f"""
+            UPDATE flags f
+            SET
+                claimed=FALSE,
+                role_id=NULL,
+                updated_at=now()
+            FROM flag_names n
+            WHERE n.flag_id=f.flag_id
+              AND f.guild_id=$1
+              AND f.role_id=$2
+            RETURNING {FLAG_ROW_COLUMNS}
+        """,
+            int(guild_id),
+            int(role_id),
+        )
+
+    for row in rows:
+        _cache_flag_row(row)
+
+    flag_events.record("release", rows, role_id=role_id)
+
+    return rows
+
+
+def _batch_outcomes(
+    flags: list[str],
+) -> tuple[dict[str, Any], list[str]]:
+
+    outcomes: dict[str, Any] = {}
+    canonical: list[str] = []
+
+    for flag in flags:
+        name = normalize_flag(flag)
+
+        if name is None:
+            outcomes[str(flag)] = None
+        elif name not in outcomes:
+            outcomes[name] = None
+            canonical.append(name)
+
+    return outcomes, canonical
+
+
+def _apply_batch_update(
+    guild_id: str,
+    map_key: str,
+    server: str,
+    rows,
+    outcomes: dict[str, Any],
+    requested: int,
+) -> None:
+
+    for row in rows:
+        outcomes[row["flag"]] = row
+        _cache_flag_row(row)
+
+    if len(rows) < requested:
+        # Some flags did not change; the cache may be behind.
+        invalidate_flag_cache(guild_id, map_key, server)
+
+
+def _apply_flag_update(
+    guild_id: str,
+    map_key: str,
+    server: str,
+    row,
+) -> None:
+
+    if row is not None:
+        _cache_flag_row(row)
+        return
+
+    # The conditional UPDATE matched nothing, so our view of this
+    # session disagrees with the database. Reload it on next read.
+    invalidate_flag_cache(guild_id, map_key, server)
 
 
 # =========================================================
@@ -484,36 +1611,145 @@ async def save_flag_message(
     server: str,
     channel_id: str,
     message_id: str,
+    render_hash: Optional[str] = None,
+) -> None:
+
+    async with safe_acquire() as conn:
+
+        await conn.execute("""
+            INSERT INTO flag_messages (
+                guild_id,
+                map,
+                server,
+                channel_id,
+                message_id,
+                render_hash
+            )
+            VALUES ($1, $2, $3, $4, $5, $6)
+
+            ON CONFLICT (
+                guild_id,
+                map,
+                server
+            )
+
+            DO UPDATE SET
+                channel_id=EXCLUDED.channel_id,
+                message_id=EXCLUDED.message_id,
+                render_hash=EXCLUDED.render_hash
+        """,
+            int(guild_id),
+            normalize_map(map_key),
+            normalize_server(server),
+            int(channel_id),
+            int(message_id),
+            render_hash,
+        )
+
+    key = session_key(guild_id, map_key, server)
+
+    _index_server(key)
+
+    _message_cache[key] = {
+        "channel_id": str(channel_id),
+        "message_id": str(message_id),
+        "render_hash": render_hash,
+    }
+
+
+async def save_render_hash(
+    guild_id: str,
+    map_key: str,
+    server: str,
+    render_hash: Optional[str],
 ) -> None:
 
     async with safe_acquire() as conn:
 
-        await conn.execute("""
-            INSERT INTO flag_messages (
-                guild_id,
-                map,
-                server,
-                channel_id,
-                message_id
-            )
-            VALUES ($1, $2, $3, $4, $5)
+        await conn.execute("""
+            UPDATE flag_messages
+            SET render_hash=$4
+            WHERE guild_id=$1
+              AND map=$2
+              AND server=$3
+        """,
+            int(guild_id),
+            normalize_map(map_key),
+            normalize_server(server),
+            render_hash,
+        )
+
+    cached = _message_cache.get(
+        session_key(guild_id, map_key, server)
+    )
+
+    if cached is not None:
+        cached["render_hash"] = render_hash
+
+
+def _index_server(key: SessionKey) -> None:
+    guild_id, map_key, server = key
+
+    _server_index.setdefault(
+        guild_id, {}
+    ).setdefault(
+        map_key, set()
+    ).add(server)
+
+
+def known_servers(
+    guild_id: str,
+    map_key: Optional[str] = None,
+) -> list[str]:
+    """Server names with a flag board in this guild, from memory."""
+
+    maps = _server_index.get(str(guild_id), {})
+
+    if map_key:
+        servers = maps.get(normalize_map(map_key), set())
+    else:
+        servers = set().union(*maps.values())
+
+    return sorted(servers)
+
+
+def _cache_message_row(
+    key: SessionKey,
+    row,
+) -> dict[str, Any]:
+
+    _index_server(key)
+
+    cached = _message_cache[key] = {
+        "channel_id": row["channel_id"],
+        "message_id": row["message_id"],
+        "render_hash": row["render_hash"],
+    }
+
+    return cached
+
+
+def cached_sessions(
+    guild_id: str,
+) -> list[SessionKey]:
+    """Sessions of a guild whose board message is currently cached."""
+
+    return [
+        key
+        for key in _message_cache
+        if key[0] == str(guild_id)
+    ]
 
-            ON CONFLICT (
-                guild_id,
-                map,
-                server
-            )
 
-            DO UPDATE SET
-                channel_id=EXCLUDED.channel_id,
-                message_id=EXCLUDED.message_id
-        """,
-            str(guild_id),
-            normalize_map(map_key),
-            normalize_server(server),
-            str(channel_id),
-            str(message_id),
-        )
+def invalidate_flag_message(
+    guild_id: str,
+    map_key: str,
+    server: str,
+) -> None:
+    _message_cache.pop(
+        session_key(guild_id, map_key, server),
+        None,
+    )
 
 
 async def get_flag_message(
@@ -521,46 +1757,157 @@ async def get_flag_message(
     map_key: str,
     server: str,
 ):
+    key = session_key(guild_id, map_key, server)
+
+    cached = _message_cache.get(key)
+
+    if cached is not None:
+        return cached
+
     async with safe_acquire() as conn:
 
-        return await conn.fetchrow("""
+        row = await conn.fetchrow("""
             SELECT
-                channel_id,
-                message_id
+                channel_id::text AS channel_id,
+                message_id::text AS message_id,
+                render_hash
             FROM flag_messages
             WHERE guild_id=$1
               AND map=$2
               AND server=$3
         """,
-            str(guild_id),
-            normalize_map(map_key),
-            normalize_server(server),
+            int(guild_id),
+            key[1],
+            key[2],
         )
 
+    if row is None:
+        return None
+
+    return _cache_message_row(key, row)
+
+
+async def preload_sessions(
+    guild_ids: list[str],
+) -> dict[str, list]:
+    """
+    Load every board and flag row for the given guilds in two queries.
+
+    Fills the flag state and message caches used for rendering and
+    returns each guild's sessions, most recently active first.
+    """
+
+    if not guild_ids:
+        return {}
+
+    ids = [int(guild_id) for guild_id in guild_ids]
+
+    writes = dict(_flag_writes)
 
-async def get_flag_sessions(
-    guild_id: str,
-):
     async with safe_acquire() as conn:
 
-        return await conn.fetch("""
+        sessions = await conn.fetch("""
             SELECT
-                map,
-                server,
-                channel_id,
-                message_id
-            FROM flag_messages
-            WHERE guild_id=$1
-            ORDER BY map, server
+                m.guild_id::text AS guild_id,
+                m.map,
+                m.server,
+                m.channel_id::text AS channel_id,
+                m.message_id::text AS message_id,
+                m.render_hash,
+                activity.last_activity
+            FROM flag_messages m
+            LEFT JOIN LATERAL (
+                SELECT MAX(f.updated_at) AS last_activity
+                FROM flags f
+                WHERE f.guild_id=m.guild_id
+                  AND f.map=m.map
+                  AND f.server=m.server
+            ) activity ON TRUE
+            WHERE m.guild_id = ANY($1::bigint[])
+            ORDER BY
+                activity.last_activity DESC NULLS LAST,
+                m.map,
+                m.server
+        """,
+            ids,
+        )
+
+        flags = await conn.fetch(f"""
+            SELECT {FLAG_ROW_COLUMNS}
+            FROM flags f
+            JOIN flag_names n
+              ON n.flag_id=f.flag_id
+            WHERE f.guild_id = ANY($1::bigint[])
         """,
-            str(guild_id),
+            ids,
         )
 
+    boards: dict[SessionKey, list] = {}
+
+    for row in sessions:
+        key = session_key(row["guild_id"], row["map"], row["server"])
+        boards[key] = []
+        _cache_message_row(key, row)
+
+    for row in flags:
+        boards.setdefault(
+            session_key(row["guild_id"], row["map"], row["server"]),
+            [],
+        ).append(row)
+
+    for key, rows in boards.items():
+        # Skip sessions written to while the preload was running.
+        if _flag_writes.get(key, 0) == writes.get(key, 0):
+            _cache_session(key, rows)
+
+    grouped: dict[str, list] = {
+        str(guild_id): []
+        for guild_id in guild_ids
+    }
+
+    for row in sessions:
+        grouped[row["guild_id"]].append(row)
+
+    return grouped
+
 
 # =========================================================
 # FLAG EMOJIS
 # =========================================================
 
+# Per-guild emoji name -> emoji, built lazily on first render and
+# dropped whenever the guild's emoji list changes.
+_emoji_index: dict[int, dict[str, discord.Emoji]] = {}
+
+
+def guild_emoji_index(
+    guild: discord.Guild,
+) -> dict[str, discord.Emoji]:
+
+    index = _emoji_index.get(guild.id)
+
+    if index is None:
+        index = {}
+
+        # First match wins, as with discord.utils.get.
+        for emoji in guild.emojis:
+            index.setdefault(emoji.name, emoji)
+
+        _emoji_index[guild.id] = index
+
+    return index
+
+
+def invalidate_emoji_index(
+    guild_id: Optional[int] = None,
+) -> None:
+
+    if guild_id is None:
+        _emoji_index.clear()
+    else:
+        _emoji_index.pop(int(guild_id), None)
+
+
 def flag_emoji(
     guild: discord.Guild | None,
     flag: str,
@@ -568,10 +1915,7 @@ def flag_emoji(
 ) -> str:
 
     if guild:
-        custom = discord.utils.get(
-            guild.emojis,
-            name=flag,
-        )
+        custom = guild_emoji_index(guild).get(flag)
 
         if custom:
             return f"{custom} "
@@ -583,6 +1927,87 @@ def flag_emoji(
     )
 
 
+# =========================================================
+# ROLE INDEX
+# =========================================================
+
+# Per-guild list of roles a flag can be assigned to, highest first.
+# Dropped on any role create, update or delete in the guild.
+_role_index: dict[int, list[discord.Role]] = {}
+
+
+def assignable_roles(
+    guild: discord.Guild,
+) -> list[discord.Role]:
+
+    roles = _role_index.get(guild.id)
+
+    if roles is None:
+        roles = sorted(
+            (
+                role
+                for role in guild.roles
+                if not role.is_default()
+                and not role.managed
+            ),
+            key=lambda role: (
+                -role.position,
+                role.name.casefold(),
+            ),
+        )
+
+        _role_index[guild.id] = roles
+
+    return roles
+
+
+# Roles with this prefix mark faction members, who may assign flags.
+FACTION_ROLE_PREFIX = "Faction-"
+
+# Per-guild faction role IDs. Dropped together with _role_index.
+_faction_index: dict[int, frozenset[int]] = {}
+
+
+def faction_role_ids(
+    guild: discord.Guild,
+) -> frozenset[int]:
+
+    role_ids = _faction_index.get(guild.id)
+
+    if role_ids is None:
+        role_ids = frozenset(
+            role.id
+            for role in guild.roles
+            if role.name.startswith(FACTION_ROLE_PREFIX)
+        )
+
+        _faction_index[guild.id] = role_ids
+
+    return role_ids
+
+
+def is_faction_member(
+    member: discord.Member,
+) -> bool:
+
+    return any(
+        member.get_role(role_id) is not None
+        for role_id in faction_role_ids(member.guild)
+    )
+
+
+def invalidate_role_index(
+    guild_id: Optional[int] = None,
+) -> None:
+
+    if guild_id is None:
+        _role_index.clear()
+        _faction_index.clear()
+    else:
+        _role_index.pop(int(guild_id), None)
+        _faction_index.pop(int(guild_id), None)
+
+
 # =========================================================
 # EMBED HELPERS
 # =========================================================
@@ -851,16 +2276,115 @@ async def create_flag_embed(
     return embed
 
 
+# =========================================================
+# BOARD DIGEST
+# =========================================================
+
+def board_digest(
+    embed: discord.Embed,
+) -> str:
+    """
+    Hash the rendered board, ignoring the render timestamp.
+
+    Two boards with the same digest look identical in Discord,
+    so publishing the second one would be a wasted edit.
+    """
+
+    data = embed.to_dict()
+    data.pop("timestamp", None)
+    data["layout_version"] = BOARD_LAYOUT_VERSION
+
+    return hashlib.sha256(
+        json.dumps(
+            data,
+            sort_keys=True,
+            ensure_ascii=False,
+        ).encode()
+    ).hexdigest()
+
+
 # =========================================================
 # REFRESH FLAG EMBED
 # =========================================================
 
+async def _edit_board(
+    message: discord.PartialMessage | discord.Message,
+    embed: discord.Embed,
+    view: Optional[discord.ui.View],
+) -> None:
+
+    if view is None:
+        await message.edit(
+            embed=embed
+        )
+    else:
+        await message.edit(
+            embed=embed,
+            view=view,
+        )
+
+
+async def _edit_board_slow(
+    guild: discord.Guild,
+    guild_id: str,
+    map_key: str,
+    server: str,
+    embed: discord.Embed,
+    view: Optional[discord.ui.View],
+) -> bool:
+    """Re-read the stored message from the database and fetch it."""
+
+    row = await get_flag_message(
+        guild_id,
+        map_key,
+        server,
+    )
+
+    if not row:
+        return False
+
+    channel = guild.get_channel(
+        int(row["channel_id"])
+    )
+
+    if not isinstance(
+        channel,
+        discord.TextChannel,
+    ):
+        return False
+
+    try:
+
+        message = await channel.fetch_message(
+            int(row["message_id"])
+        )
+
+        await _edit_board(message, embed, view)
+
+    except discord.NotFound:
+        invalidate_flag_message(guild_id, map_key, server)
+        return False
+
+    except discord.Forbidden:
+        return False
+
+    return True
+
+
 async def refresh_flag_embed(
     bot: discord.Client,
     guild_id: str,
     map_key: str,
     server: str,
+    view: Optional[discord.ui.View] = None,
 ) -> bool:
+    """
+    Publish the current state of a board.
+
+    Returns False when the board cannot be published at all (no guild,
+    no stored message, message deleted, no access). Other HTTP and
+    database errors are raised so the caller can decide to retry.
+    """
 
     guild = bot.get_guild(
         int(guild_id)
@@ -878,6 +2402,19 @@ async def refresh_flag_embed(
     if not row:
         return False
 
+    embed = await create_flag_embed(
+        guild_id,
+        map_key,
+        server,
+        guild,
+    )
+
+    digest = board_digest(embed)
+
+    # Unchanged board: the message already shows exactly this.
+    if row["render_hash"] == digest:
+        return True
+
     channel = guild.get_channel(
         int(row["channel_id"])
     )
@@ -888,28 +2425,438 @@ async def refresh_flag_embed(
     ):
         return False
 
+    # Fast path: edit through a partial message built from the cached
+    # IDs, so a refresh costs a single PATCH and no GET.
+    message = channel.get_partial_message(
+        int(row["message_id"])
+    )
+
     try:
+        await _edit_board(message, embed, view)
 
-        message = await channel.fetch_message(
-            int(row["message_id"])
-        )
+    except discord.NotFound:
+        invalidate_flag_message(guild_id, map_key, server)
 
-        embed = await create_flag_embed(
+        if not await _edit_board_slow(
+            guild,
             guild_id,
             map_key,
             server,
-            guild,
+            embed,
+            view,
+        ):
+            return False
+
+    except discord.Forbidden:
+        return False
+
+    await save_render_hash(
+        guild_id,
+        map_key,
+        server,
+        digest,
+    )
+
+    return True
+
+
+# =========================================================
+# REFRESH SCHEDULER
+# =========================================================
+
+REFRESH_DEBOUNCE_SECONDS = float(
+    os.getenv("FLAG_REFRESH_DEBOUNCE", "1.5")
+)
+
+# Waits before retrying a refresh that failed transiently.
+REFRESH_RETRY_DELAYS = (2.0, 5.0, 15.0, 30.0, 60.0)
+
+
+def _is_transient_http_error(
+    exc: discord.HTTPException,
+) -> bool:
+    return (
+        isinstance(exc, discord.DiscordServerError)
+        or exc.status >= 500
+        or exc.status == 429
+    )
+
+
+class FlagRefreshScheduler:
+    """
+    Coalesces board refreshes per session.
+
+    The first request for a session starts one worker that waits out
+    the debounce window and then publishes whatever state exists at
+    that moment. Requests arriving while a publish is in flight cause
+    exactly one more pass, so the final state is always published.
+    Transient failures (Discord 5xx/429, database errors) are retried
+    with backoff; other 4xx responses and the permanent outcomes of
+    refresh_flag_embed end the worker without publishing.
+    """
+
+    def __init__(
+        self,
+        delay: float = REFRESH_DEBOUNCE_SECONDS,
+    ):
+        self.delay = delay
+
+        self._tasks: dict[SessionKey, asyncio.Task] = {}
+        self._generations: dict[SessionKey, int] = {}
+        self._views: dict[SessionKey, discord.ui.View] = {}
+        self._flush = asyncio.Event()
+
+        self.requested = 0
+        self.published = 0
+        self.failed = 0
+        self.retried = 0
+
+    def schedule(
+        self,
+        bot: discord.Client,
+        guild_id: str,
+        map_key: str,
+        server: str,
+        view: Optional[discord.ui.View] = None,
+    ) -> None:
+
+        key = session_key(guild_id, map_key, server)
+
+        self.requested += 1
+
+        self._generations[key] = (
+            self._generations.get(key, 0) + 1
         )
 
-        await message.edit(
-            embed=embed
+        if view is not None:
+            self._views[key] = view
+
+        if key not in self._tasks:
+            self._tasks[key] = asyncio.create_task(
+                self._run(bot, key)
+            )
+
+    async def _run(
+        self,
+        bot: discord.Client,
+        key: SessionKey,
+    ) -> None:
+
+        attempt = 0
+        view = None
+
+        try:
+            while True:
+                if attempt == 0 and not self._flush.is_set():
+                    with contextlib.suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(
+                            self._flush.wait(),
+                            timeout=self.delay,
+                        )
+
+                generation = self._generations[key]
+
+                # A retry reuses the last view unless a newer one came.
+                view = self._views.pop(key, view)
+
+                try:
+                    ok = await refresh_flag_embed(
+                        bot,
+                        *key,
+                        view=view,
+                    )
+                except discord.HTTPException as exc:
+                    if not _is_transient_http_error(exc):
+                        # Other 4xx (bad embed, missing access) will
+                        # fail the same way again.
+                        log.warning(
+                            "Scheduled flag refresh rejected | "
+                            "session=%s status=%s",
+                            key,
+                            exc.status,
+                        )
+                        ok = False
+                    else:
+                        log.warning(
+                            "Scheduled flag refresh failed | session=%s "
+                            "attempt=%d status=%s",
+                            key,
+                            attempt + 1,
+                            exc.status,
+                        )
+                        ok = None
+                except Exception:
+                    log.warning(
+                        "Scheduled flag refresh failed | session=%s "
+                        "attempt=%d",
+                        key,
+                        attempt + 1,
+                        exc_info=True,
+                    )
+                    ok = None
+
+                if ok is None and attempt < len(REFRESH_RETRY_DELAYS):
+                    self.retried += 1
+
+                    # A flush (shutdown) cuts the backoff short.
+                    with contextlib.suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(
+                            self._flush.wait(),
+                            timeout=REFRESH_RETRY_DELAYS[attempt],
+                        )
+
+                    attempt += 1
+                    continue
+
+                if ok:
+                    self.published += 1
+                else:
+                    self.failed += 1
+
+                if self._generations[key] == generation:
+                    break
+
+                attempt = 0
+                view = None
+
+        finally:
+            self._tasks.pop(key, None)
+            self._generations.pop(key, None)
+            self._views.pop(key, None)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._tasks)
+
+    @property
+    def coalescing_ratio(self) -> float:
+        """Refresh requests per message edit actually attempted."""
+
+        attempts = self.published + self.failed
+
+        return (
+            self.requested / attempts
+            if attempts
+            else 0.0
         )
 
-        return True
+    def stats(self) -> dict[str, Any]:
+        return {
+            "queue_depth": self.queue_depth,
+            "requested": self.requested,
+            "published": self.published,
+            "failed": self.failed,
+            "retried": self.retried,
+            "coalescing_ratio": round(self.coalescing_ratio, 2),
+        }
+
+    async def flush(
+        self,
+        timeout: float = 10.0,
+    ) -> None:
+        """Publish every pending session now, e.g. before shutdown."""
+
+        self._flush.set()
+
+        try:
+            tasks = list(self._tasks.values())
+
+            if tasks:
+                await asyncio.wait(tasks, timeout=timeout)
+        finally:
+            self._flush.clear()
+
+
+refresh_scheduler = FlagRefreshScheduler()
+
+
+def schedule_flag_refresh(
+    bot: discord.Client,
+    guild_id: str,
+    map_key: str,
+    server: str,
+    view: Optional[discord.ui.View] = None,
+) -> None:
+    refresh_scheduler.schedule(
+        bot,
+        guild_id,
+        map_key,
+        server,
+        view,
+    )
+
+
+# =========================================================
+# FLAG EVENTS
+# =========================================================
+
+FLAG_EVENT_FLUSH_INTERVAL = float(
+    os.getenv("FLAG_EVENT_FLUSH_INTERVAL", "2.0")
+)
+
+FLAG_EVENT_BATCH_SIZE = 500
+
+# Events kept in memory while the database is unreachable.
+FLAG_EVENT_BUFFER_LIMIT = 50_000
 
-    except (
-        discord.NotFound,
-        discord.Forbidden,
-        discord.HTTPException,
+FLAG_EVENT_COLUMNS = (
+    "guild_id",
+    "map",
+    "server",
+    "flag",
+    "action",
+    "role_id",
+    "actor_id",
+    "occurred_at",
+)
+
+
+class FlagEventWriter:
+    """
+    Appends claim/release history to flag_events in the background.
+
+    record() only buffers, so the interaction path never waits on the
+    audit write. One task copies the buffer with COPY every flush
+    interval, or sooner once a full batch is waiting.
+    """
+
+    def __init__(
+        self,
+        interval: float = FLAG_EVENT_FLUSH_INTERVAL,
+        batch_size: int = FLAG_EVENT_BATCH_SIZE,
     ):
-        return False
+        self.interval = interval
+        self.batch_size = batch_size
+
+        self._buffer: list[tuple] = []
+        self._task: Optional[asyncio.Task] = None
+        self._ready = asyncio.Event()
+        self._closing = False
+
+        self.written = 0
+        self.dropped = 0
+
+    def record(
+        self,
+        action: str,
+        rows,
+        actor_id: Optional[int] = None,
+        role_id: Optional[int] = None,
+    ) -> None:
+        """
+        Buffer one event per changed row.
+
+        Claims take the role from the row itself; releases from
+        released_role_id, unless role_id is given.
+        """
+
+        if not rows:
+            return
+
+        occurred_at = discord.utils.utcnow()
+
+        for row in rows:
+            if role_id is not None:
+                event_role = role_id
+            elif action == "claim":
+                event_role = row["role_id"]
+            else:
+                event_role = row["released_role_id"]
+
+            self._buffer.append((
+                int(row["guild_id"]),
+                row["map"],
+                row["server"],
+                row["flag"],
+                action,
+                int(event_role) if event_role is not None else None,
+                actor_id,
+                occurred_at,
+            ))
+
+        if len(self._buffer) > FLAG_EVENT_BUFFER_LIMIT:
+            overflow = len(self._buffer) - FLAG_EVENT_BUFFER_LIMIT
+            del self._buffer[:overflow]
+            self.dropped += overflow
+
+        if len(self._buffer) >= self.batch_size:
+            self._ready.set()
+
+        if self._task is None or self._task.done():
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while not self._closing:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    self._ready.wait(),
+                    timeout=self.interval,
+                )
+
+            self._ready.clear()
+
+            await self._write()
+
+        await self._write()
+
+    async def _write(self) -> None:
+        while self._buffer:
+            batch = self._buffer[:self.batch_size]
+            del self._buffer[:len(batch)]
+
+            try:
+                async with safe_acquire() as conn:
+                    await conn.copy_records_to_table(
+                        "flag_events",
+                        records=batch,
+                        columns=FLAG_EVENT_COLUMNS,
+                    )
+
+            except asyncio.CancelledError:
+                self._buffer[:0] = batch
+                raise
+
+            except Exception:
+                log.exception(
+                    "Writing %d flag event(s) failed; will retry.",
+                    len(batch),
+                )
+
+                # Keep the batch for the next flush.
+                self._buffer[:0] = batch
+                return
+
+            self.written += len(batch)
+
+    async def close(
+        self,
+        timeout: float = 10.0,
+    ) -> None:
+        """Write everything still buffered, e.g. before shutdown."""
+
+        if self._task is None or self._task.done():
+            return
+
+        self._closing = True
+        self._ready.set()
+
+        try:
+            await asyncio.wait_for(self._task, timeout=timeout)
+        except asyncio.TimeoutError:
+            log.warning(
+                "Flag event flush timed out | unwritten=%d",
+                len(self._buffer),
+            )
+        except Exception:
+            log.exception("Flag event writer failed during shutdown.")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "buffered": len(self._buffer),
+            "written": self.written,
+            "dropped": self.dropped,
+        }
+
+
+flag_events = FlagEventWriter()
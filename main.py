@@ -213,6 +213,12 @@ async def initialize() -> None:
                 min(3 * attempt, 15)
             )
 
+    # -----------------------------------------------------
+    # Follow flag changes made by other processes.
+    # -----------------------------------------------------
+
+    await utils.start_listener(bot)
+
     # -----------------------------------------------------
     # Load Discord Cogs.
     # -----------------------------------------------------
@@ -290,6 +296,40 @@ async def shutdown() -> None:
 
     LOG.info("Shutdown started.")
 
+    # -----------------------------------------------------
+    # Publish any debounced flag board refreshes.
+    # -----------------------------------------------------
+
+    try:
+        await utils.refresh_scheduler.flush()
+
+        LOG.info(
+            "Flag refresh stats: %s",
+            utils.refresh_scheduler.stats(),
+        )
+
+    except Exception:
+        LOG.exception(
+            "Flag refresh flush failed."
+        )
+
+    # -----------------------------------------------------
+    # Write buffered flag history.
+    # -----------------------------------------------------
+
+    try:
+        await utils.flag_events.close()
+
+        LOG.info(
+            "Flag event stats: %s",
+            utils.flag_events.stats(),
+        )
+
+    except Exception:
+        LOG.exception(
+            "Flag event flush failed."
+        )
+
     # -----------------------------------------------------
     # Close database.
     # -----------------------------------------------------
@@ -1,16 +1,327 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 import asyncio
+import heapq
 import re
 
+from cogs import utils
+
+
+FOOTER_ICON = "https://i.postimg.cc/rmXpLFpv/ewn60cg6.png"
+
+# How far ahead the scheduler loads reminders from the database.
+# Reminders due later stay in Postgres until their window comes up.
+REMINDER_WINDOW = timedelta(hours=1)
+
+# Maximum reminders loaded per window query.
+REMINDER_BATCH = 500
+
+# How long a delivery owns a reminder. If the process dies mid-send,
+# the reminder becomes loadable again once the claim expires.
+REMINDER_CLAIM = timedelta(minutes=5)
+
+# Delays before retrying a failed send; give up after the last one.
+REMINDER_RETRY_DELAYS = (
+    timedelta(seconds=30),
+    timedelta(minutes=2),
+    timedelta(minutes=10),
+    timedelta(minutes=30),
+)
+
+MAX_LISTED_REMINDERS = 25
+
+
+# =========================================================
+# REMINDER SCHEDULER
+# =========================================================
+
+class ReminderScheduler:
+    """
+    Delivers stored reminders from one task.
+
+    Only reminders due before the end of the current window are held
+    in memory, in a heap ordered by due time. The task sleeps until the
+    nearest reminder or the end of the window, whichever is first, and
+    then reloads the next window from the due_at index.
+    """
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+        # (due_ts, reminder_id)
+        self._heap = []
+
+        # reminder_id -> row for reminders currently in the heap.
+        # Cancelled reminders are removed here and skipped lazily.
+        self._pending = {}
+
+        self._window_end = datetime.min.replace(tzinfo=timezone.utc)
+
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._sends = set()
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+            self._task = None
+
+    def add(self, row):
+        """Track a reminder if it falls inside the loaded window."""
+
+        if row["due_at"] >= self._window_end:
+            return
+
+        if row["reminder_id"] in self._pending:
+            return
+
+        self._pending[row["reminder_id"]] = row
+
+        heapq.heappush(
+            self._heap,
+            (row["due_at"].timestamp(), row["reminder_id"])
+        )
+
+        self._wake.set()
+
+    def discard(self, reminder_id: int):
+        self._pending.pop(reminder_id, None)
+
+    async def _load_window(self):
+        window_end = datetime.now(timezone.utc) + REMINDER_WINDOW
+
+        async with utils.safe_acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT
+                    reminder_id,
+                    guild_id,
+                    channel_id,
+                    user_id,
+                    message,
+                    label,
+                    due_at
+                FROM reminders
+                WHERE due_at < $1
+                AND (claimed_until IS NULL OR claimed_until < now())
+                ORDER BY due_at
+                LIMIT $2
+                """,
+                window_end,
+                REMINDER_BATCH
+            )
+
+        # A full batch may have cut the window short; continue from
+        # the last loaded reminder next time instead.
+        if len(rows) == REMINDER_BATCH:
+            window_end = rows[-1]["due_at"]
+
+        self._window_end = window_end
+
+        for row in rows:
+            if row["reminder_id"] not in self._pending:
+                self._pending[row["reminder_id"]] = row
+
+                heapq.heappush(
+                    self._heap,
+                    (row["due_at"].timestamp(), row["reminder_id"])
+                )
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+
+            now = datetime.now(timezone.utc)
+
+            if now >= self._window_end:
+                try:
+                    await self._load_window()
+                except Exception as e:
+                    print(f"❌ Failed to load reminders: {e}")
+                    await asyncio.sleep(30)
+                    continue
+
+            wake_at = self._window_end.timestamp()
+
+            if self._heap:
+                wake_at = min(wake_at, self._heap[0][0])
+
+            delay = wake_at - now.timestamp()
+
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(
+                        self._wake.wait(),
+                        timeout=delay
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+                continue
+
+            if not self._heap or self._heap[0][0] > now.timestamp():
+                continue
+
+            _, reminder_id = heapq.heappop(self._heap)
+
+            row = self._pending.pop(reminder_id, None)
+
+            if row is None:
+                continue
+
+            task = asyncio.create_task(self._deliver(row))
+
+            self._sends.add(task)
+            task.add_done_callback(self._sends.discard)
+
+    async def _deliver(self, row):
+        # Claim the reminder so no other process sends it meanwhile.
+        # A cancel deletes the row, which makes the claim miss.
+        async with utils.safe_acquire() as conn:
+            attempts = await conn.fetchval(
+                """
+                UPDATE reminders
+                SET claimed_until=now() + $2::interval
+                WHERE reminder_id=$1
+                AND (claimed_until IS NULL OR claimed_until < now())
+                RETURNING attempts
+                """,
+                row["reminder_id"],
+                REMINDER_CLAIM
+            )
+
+        if attempts is None:
+            return
+
+        channel = self.bot.get_partial_messageable(
+            row["channel_id"],
+            guild_id=row["guild_id"]
+        )
+
+        reminder_embed = discord.Embed(
+            title="⏰ Reminder",
+            description=row["message"],
+            color=discord.Color.blurple()
+        )
+
+        reminder_embed.add_field(
+            name="Set For",
+            value=f"`{row['label']}`",
+            inline=True
+        )
+
+        reminder_embed.set_footer(
+            text="DayZ Manager",
+            icon_url=FOOTER_ICON
+        )
+
+        reminder_embed.timestamp = discord.utils.utcnow()
+
+        try:
+            await channel.send(
+                content=f"<@{row['user_id']}>",
+                embed=reminder_embed
+            )
+
+        except (discord.Forbidden, discord.NotFound):
+            # The channel is gone or closed to us; retrying won't help.
+            print(
+                f"❌ Could not send reminder in channel "
+                f"{row['channel_id']}."
+            )
+
+        except discord.HTTPException as e:
+            if attempts < len(REMINDER_RETRY_DELAYS):
+                print(
+                    f"❌ Failed to send reminder in channel "
+                    f"{row['channel_id']}: {e}; retrying."
+                )
+
+                await self._retry(row, attempts)
+                return
+
+            print(
+                f"❌ Giving up on reminder {row['reminder_id']} in "
+                f"channel {row['channel_id']}: {e}"
+            )
+
+        except Exception:
+            # Unexpected failure: release the claim so it is retried.
+            await self._retry(row, attempts)
+            raise
+
+        async with utils.safe_acquire() as conn:
+            await conn.execute(
+                "DELETE FROM reminders WHERE reminder_id=$1",
+                row["reminder_id"]
+            )
+
+    async def _retry(self, row, attempts: int):
+        delay = REMINDER_RETRY_DELAYS[
+            min(attempts, len(REMINDER_RETRY_DELAYS) - 1)
+        ]
+
+        async with utils.safe_acquire() as conn:
+            due_at = await conn.fetchval(
+                """
+                UPDATE reminders
+                SET
+                    due_at=now() + $2::interval,
+                    claimed_until=NULL,
+                    attempts=attempts + 1
+                WHERE reminder_id=$1
+                RETURNING due_at
+                """,
+                row["reminder_id"],
+                delay
+            )
+
+        if due_at is not None:
+            self.add({**row, "due_at": due_at})
+
+
+# =========================================================
+# REMINDER COG
+# =========================================================
 
 class Reminder(commands.Cog):
     """Create personal channel reminders."""
 
+    reminders = app_commands.Group(
+        name="reminders",
+        description="Manage your pending reminders."
+    )
+
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
+        self.scheduler = ReminderScheduler(bot)
+
+    async def cog_unload(self):
+        await self.scheduler.stop()
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Channels must be reachable before anything is delivered.
+        self.scheduler.start()
+
     @app_commands.command(
         name="reminder",
         description="Set a reminder that will be posted in this channel."
@@ -87,7 +398,40 @@ class Reminder(commands.Cog):
                 ephemeral=True
             )
 
-        # Respond immediately
+        due_at = discord.utils.utcnow() + timedelta(seconds=delay)
+
+        # Store the reminder before confirming it
+        async with utils.safe_acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                INSERT INTO reminders (
+                    guild_id,
+                    channel_id,
+                    user_id,
+                    message,
+                    label,
+                    due_at
+                )
+                VALUES ($1, $2, $3, $4, $5, $6)
+                RETURNING
+                    reminder_id,
+                    guild_id,
+                    channel_id,
+                    user_id,
+                    message,
+                    label,
+                    due_at
+                """,
+                interaction.guild_id,
+                interaction.channel_id,
+                interaction.user.id,
+                message,
+                time.name,
+                due_at
+            )
+
+        self.scheduler.add(row)
+
         embed = discord.Embed(
             title="⏰ Reminder Set",
             description=(
@@ -99,8 +443,8 @@ class Reminder(commands.Cog):
         )
 
         embed.set_footer(
-            text="DayZ Manager",
-            icon_url="https://i.postimg.cc/rmXpLFpv/ewn60cg6.png"
+            text=f"DayZ Manager • Reminder #{row['reminder_id']}",
+            icon_url=FOOTER_ICON
         )
 
         embed.timestamp = discord.utils.utcnow()
@@ -110,50 +454,145 @@ class Reminder(commands.Cog):
             ephemeral=True
         )
 
-        # Save the channel where the command was used
-        channel = interaction.channel
+    # =====================================================
+    # /reminders list
+    # =====================================================
 
-        # Wait until reminder is due
-        await asyncio.sleep(delay)
-
-        # Send the reminder in the same channel
-        try:
-            reminder_embed = discord.Embed(
-                title="⏰ Reminder",
-                description=message,
-                color=discord.Color.blurple()
+    async def user_reminders(self, user_id: int, limit: int):
+        async with utils.safe_acquire() as conn:
+            return await conn.fetch(
+                """
+                SELECT
+                    reminder_id,
+                    channel_id,
+                    message,
+                    due_at
+                FROM reminders
+                WHERE user_id=$1
+                ORDER BY due_at
+                LIMIT $2
+                """,
+                user_id,
+                limit
             )
 
-            reminder_embed.add_field(
-                name="Set For",
-                value=f"`{time.name}`",
-                inline=True
-            )
+    @reminders.command(
+        name="list",
+        description="Show your pending reminders."
+    )
+    async def reminders_list(
+        self,
+        interaction: discord.Interaction
+    ):
+        rows = await self.user_reminders(
+            interaction.user.id,
+            MAX_LISTED_REMINDERS
+        )
 
-            reminder_embed.set_footer(
-                text="DayZ Manager",
-                icon_url="https://i.postimg.cc/rmXpLFpv/ewn60cg6.png"
+        if not rows:
+            return await interaction.response.send_message(
+                "You have no pending reminders.",
+                ephemeral=True
             )
 
-            reminder_embed.timestamp = discord.utils.utcnow()
+        lines = []
 
-            await channel.send(
-                content=interaction.user.mention,
-                embed=reminder_embed
+        for row in rows:
+            due = discord.utils.format_dt(row["due_at"], "R")
+            text = discord.utils.escape_markdown(row["message"])
+
+            if len(text) > 80:
+                text = text[:77] + "..."
+
+            lines.append(
+                f"**#{row['reminder_id']}** • {due} • "
+                f"<#{row['channel_id']}>\n{text}"
             )
 
-        except discord.Forbidden:
-            print(
-                f"❌ Could not send reminder in channel "
-                f"{channel.id}."
+        embed = discord.Embed(
+            title="⏰ Your Reminders",
+            description="\n\n".join(lines),
+            color=discord.Color.blurple()
+        )
+
+        embed.set_footer(
+            text="Use /reminders cancel to remove one.",
+            icon_url=FOOTER_ICON
+        )
+
+        await interaction.response.send_message(
+            embed=embed,
+            ephemeral=True
+        )
+
+    # =====================================================
+    # /reminders cancel
+    # =====================================================
+
+    async def reminder_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str
+    ):
+        rows = await self.user_reminders(
+            interaction.user.id,
+            MAX_LISTED_REMINDERS
+        )
+
+        current = current.lower()
+        choices = []
+
+        for row in rows:
+            name = f"#{row['reminder_id']} • {row['message']}"[:100]
+
+            if current in name.lower():
+                choices.append(
+                    app_commands.Choice(
+                        name=name,
+                        value=row["reminder_id"]
+                    )
+                )
+
+        return choices
+
+    @reminders.command(
+        name="cancel",
+        description="Cancel one of your pending reminders."
+    )
+    @app_commands.describe(
+        reminder="The reminder to cancel."
+    )
+    @app_commands.autocomplete(reminder=reminder_autocomplete)
+    async def reminders_cancel(
+        self,
+        interaction: discord.Interaction,
+        reminder: int
+    ):
+        async with utils.safe_acquire() as conn:
+            deleted = await conn.fetchval(
+                """
+                DELETE FROM reminders
+                WHERE reminder_id=$1
+                AND user_id=$2
+                RETURNING reminder_id
+                """,
+                reminder,
+                interaction.user.id
             )
 
-        except discord.HTTPException as e:
-            print(
-                f"❌ Failed to send reminder in channel "
-                f"{channel.id}: {e}"
+        if deleted is None:
+            return await interaction.response.send_message(
+                f"❌ You have no pending reminder `#{reminder}`.",
+                ephemeral=True
             )
 
+        self.scheduler.discard(deleted)
+
+        await interaction.response.send_message(
+            f"✅ Reminder `#{deleted}` cancelled.",
+            ephemeral=True
+        )
+
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(Reminder(bot))
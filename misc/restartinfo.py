@@ -3,18 +3,30 @@ from discord import app_commands
 from discord.ext import commands
 
 from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from typing import Optional
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
+import asyncpg
 import json
-import os
+import time
+import heapq
 import asyncio
 
+from cogs import utils
+
 
 # =========================================================
 # CONFIGURATION
 # =========================================================
 
-CONFIG_FILE = "restart_configs.json"
+# Restart configs used to live in restart_configs.json, opened relative
+# to the process CWD. Both the project root and the CWD are checked; each
+# file found is imported into the restart_configs table once, then renamed.
+LEGACY_CONFIG_FILES = (
+    Path(__file__).resolve().parent.parent / "restart_configs.json",
+    Path("restart_configs.json"),
+)
 
 DEFAULT_INTERVAL = 2
 DEFAULT_TIME = "20:00"
@@ -29,6 +41,211 @@ ALLOWED_INTERVALS = {
     24: "Every 24 Hours",
 }
 
+# Minutes before each restart at which a warning is posted.
+WARNING_MINUTES = (30, 10, 5)
+
+# Warnings more than this many seconds late (bot suspended, gateway
+# outage) are dropped rather than posted out of date.
+WARNING_GRACE = 60
+
+# Upper bound on a single scheduler sleep so wall-clock jumps are
+# noticed without waiting for the nearest entry.
+MAX_WARNING_SLEEP = 3600
+
+
+# =========================================================
+# RESTART WARNING SCHEDULER
+# =========================================================
+
+class RestartWarningScheduler:
+    """
+    Posts restart warnings for every configured guild from one task.
+
+    Upcoming warnings live in a single heap ordered by due time, and the
+    task sleeps until the nearest one (or until woken by a schedule
+    change). Rescheduling a guild bumps its generation; older heap
+    entries are skipped lazily when they surface.
+
+    Each guild only has entries for its next restart plus a marker at
+    the restart itself. When the marker fires the following cycle is
+    recomputed from the wall clock, so DST transitions are picked up.
+    """
+
+    def __init__(self, cog: "RestartInfo"):
+        self.cog = cog
+
+        # (due_ts, guild_id, generation, restart_ts, minutes)
+        # minutes == 0 marks the restart itself.
+        self._heap = []
+
+        self._generations = {}
+        self._configs = {}
+
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._sends = set()
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+            self._task = None
+
+    def schedule(self, guild_id: int, config: Optional[dict]):
+        """(Re)plan warnings for a guild. A falsy config removes it."""
+
+        generation = self._generations.get(guild_id, 0) + 1
+        self._generations[guild_id] = generation
+
+        if not config or not config.get("warning_channel_id"):
+            self._configs.pop(guild_id, None)
+            return
+
+        self._configs[guild_id] = config
+
+        now = datetime.now(timezone.utc)
+
+        _, upcoming = self.cog.calculate_restart_times(
+            config,
+            count=1,
+            now=now
+        )
+
+        restart_ts = upcoming[0].timestamp()
+
+        for minutes in WARNING_MINUTES:
+            due_ts = restart_ts - minutes * 60
+
+            if due_ts > now.timestamp():
+                heapq.heappush(
+                    self._heap,
+                    (due_ts, guild_id, generation, restart_ts, minutes)
+                )
+
+        heapq.heappush(
+            self._heap,
+            (restart_ts, guild_id, generation, restart_ts, 0)
+        )
+
+        self._compact()
+        self._wake.set()
+
+    def _compact(self):
+        """Drop superseded entries once they outnumber live ones."""
+
+        live_limit = (len(WARNING_MINUTES) + 1) * len(self._configs)
+
+        if len(self._heap) <= 2 * live_limit + 64:
+            return
+
+        self._heap = [
+            entry
+            for entry in self._heap
+            if self._generations.get(entry[1]) == entry[2]
+        ]
+
+        heapq.heapify(self._heap)
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+
+            if not self._heap:
+                await self._wake.wait()
+                continue
+
+            delay = self._heap[0][0] - time.time()
+
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(
+                        self._wake.wait(),
+                        timeout=min(delay, MAX_WARNING_SLEEP)
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+                continue
+
+            due_ts, guild_id, generation, restart_ts, minutes = (
+                heapq.heappop(self._heap)
+            )
+
+            if self._generations.get(guild_id) != generation:
+                continue
+
+            if minutes == 0:
+                self.schedule(guild_id, self._configs.get(guild_id))
+                continue
+
+            if time.time() - due_ts > WARNING_GRACE:
+                continue
+
+            task = asyncio.create_task(
+                self._send(
+                    guild_id,
+                    self._configs[guild_id]["warning_channel_id"],
+                    restart_ts,
+                    minutes
+                )
+            )
+
+            self._sends.add(task)
+            task.add_done_callback(self._sends.discard)
+
+    async def _send(
+        self,
+        guild_id: int,
+        channel_id: int,
+        restart_ts: float,
+        minutes: int
+    ):
+        channel = self.cog.bot.get_channel(channel_id)
+
+        if channel is None:
+            print(
+                f"[RestartInfo] Warning channel {channel_id} for guild "
+                f"{guild_id} is not available."
+            )
+            return
+
+        restart = datetime.fromtimestamp(restart_ts, timezone.utc)
+
+        embed = discord.Embed(
+            title=f"⚠️ Server Restart in {minutes} Minutes",
+            description=(
+                f"The server restarts "
+                f"{self.cog.discord_timestamp(restart, 'R')} "
+                f"at {self.cog.discord_timestamp(restart, 't')}."
+            ),
+            color=discord.Color.orange()
+        )
+
+        embed.set_footer(
+            text="Use /restartinfo to view the restart schedule."
+        )
+
+        try:
+            await channel.send(embed=embed)
+        except discord.HTTPException as e:
+            print(
+                f"[RestartInfo] Failed to post restart warning "
+                f"for guild {guild_id}: {e}"
+            )
+
 
 # =========================================================
 # RESTART INFO COG
@@ -49,75 +266,242 @@ class RestartInfo(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
+        # guild_id -> stored config, or None when the guild has none.
+        # Filled lazily, one guild at a time.
         self.configs = {}
-        self.config_lock = asyncio.Lock()
 
-        self.load_configs()
+        self.warnings = RestartWarningScheduler(self)
+
+    async def cog_load(self):
+        await self.import_legacy_configs()
+
+    async def cog_unload(self):
+        await self.warnings.stop()
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Discord can fire on_ready more than once after reconnects.
+        if self.warnings.running:
+            return
+
+        for guild_id, config in (await self.load_warning_configs()).items():
+            self.warnings.schedule(guild_id, config)
+
+        self.warnings.start()
 
     # =====================================================
-    # CONFIG FILE
+    # CONFIG STORE
     # =====================================================
 
-    def load_configs(self):
-        """Load restart configurations from disk."""
+    async def import_legacy_configs(self):
+        """One-time import of restart_configs.json into Postgres."""
 
-        if not os.path.exists(CONFIG_FILE):
-            self.configs = {}
-            return
+        seen = set()
 
-        try:
-            with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                self.configs = json.load(f)
+        for path in LEGACY_CONFIG_FILES:
+            path = path.resolve()
+
+            if path in seen:
+                continue
+
+            seen.add(path)
+
+            if not path.exists():
+                continue
+
+            # A failed one-off import must not keep the cog from loading.
+            try:
+                await self.import_legacy_file(path)
+            except (OSError, asyncpg.PostgresError, ValueError) as e:
+                print(f"[RestartInfo] Failed to import {path}: {e}")
 
+    async def import_legacy_file(self, path: Path):
+        def read():
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        try:
+            legacy = await asyncio.to_thread(read)
         except (json.JSONDecodeError, OSError):
             print(
-                f"[RestartInfo] Failed to load {CONFIG_FILE}. "
-                f"Starting with empty configuration."
+                f"[RestartInfo] Failed to read {path}; "
+                f"skipping import."
             )
-            self.configs = {}
+            return
+
+        if not isinstance(legacy, dict):
+            raise ValueError("expected a JSON object of guild configs")
 
-    async def save_configs(self):
-        """Save restart configurations to disk."""
+        rows = []
 
-        async with self.config_lock:
+        for guild_id, config in legacy.items():
             try:
-                with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-                    json.dump(
-                        self.configs,
-                        f,
-                        indent=4,
-                        sort_keys=True
-                    )
+                rows.append((
+                    int(guild_id),
+                    int(config.get("interval", DEFAULT_INTERVAL)),
+                    config.get("restart_time", DEFAULT_TIME),
+                    config.get("timezone", DEFAULT_TIMEZONE),
+                ))
+            except (AttributeError, TypeError, ValueError):
+                print(f"[RestartInfo] Skipping invalid config for {guild_id}.")
+
+        async with utils.safe_acquire() as conn:
+            await conn.executemany(
+                """
+                INSERT INTO restart_configs (
+                    guild_id,
+                    interval,
+                    restart_time,
+                    timezone
+                )
+                VALUES ($1, $2, $3, $4)
+                ON CONFLICT (guild_id) DO NOTHING
+                """,
+                rows
+            )
+
+        print(
+            f"[RestartInfo] Imported {len(rows)} restart config(s) "
+            f"from {path}."
+        )
+
+        # Re-importing is harmless (ON CONFLICT DO NOTHING), so a failed
+        # rename only means the file is read again next start.
+        try:
+            await asyncio.to_thread(
+                path.rename,
+                path.with_name(path.name + ".imported")
+            )
+        except OSError as e:
+            print(f"[RestartInfo] Could not rename {path}: {e}")
+
+    async def load_config(self, guild_id: int):
+        """Return a guild's stored config, loading it on first use."""
+
+        guild_id = str(guild_id)
+
+        if guild_id in self.configs:
+            return self.configs[guild_id]
+
+        async with utils.safe_acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                SELECT
+                    interval,
+                    restart_time,
+                    timezone,
+                    warning_channel_id
+                FROM restart_configs
+                WHERE guild_id=$1
+                """,
+                int(guild_id)
+            )
+
+        self.configs[guild_id] = dict(row) if row else None
+
+        return self.configs[guild_id]
+
+    async def load_warning_configs(self):
+        """Load every config with a warning channel, keyed by guild ID."""
+
+        async with utils.safe_acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT
+                    guild_id,
+                    interval,
+                    restart_time,
+                    timezone,
+                    warning_channel_id
+                FROM restart_configs
+                WHERE warning_channel_id IS NOT NULL
+                """
+            )
+
+        configs = {}
+
+        for row in rows:
+            config = dict(row)
+            guild_id = config.pop("guild_id")
+
+            self.configs[str(guild_id)] = config
+            configs[guild_id] = config
+
+        return configs
+
+    async def save_config(self, guild_id: int, config: dict):
+        """Insert or replace a guild's restart config."""
+
+        async with utils.safe_acquire() as conn:
+            await conn.execute(
+                """
+                INSERT INTO restart_configs (
+                    guild_id,
+                    interval,
+                    restart_time,
+                    timezone,
+                    warning_channel_id
+                )
+                VALUES ($1, $2, $3, $4, $5)
+                ON CONFLICT (guild_id) DO UPDATE SET
+                    interval=EXCLUDED.interval,
+                    restart_time=EXCLUDED.restart_time,
+                    timezone=EXCLUDED.timezone,
+                    warning_channel_id=EXCLUDED.warning_channel_id,
+                    updated_at=now()
+                """,
+                int(guild_id),
+                config["interval"],
+                config["restart_time"],
+                config["timezone"],
+                config.get("warning_channel_id")
+            )
 
-            except OSError as e:
-                print(f"[RestartInfo] Failed to save config: {e}")
+        self.configs[str(guild_id)] = dict(config)
+
+        self.warnings.schedule(int(guild_id), config)
+
+    async def delete_config(self, guild_id: int):
+        """Remove a guild's restart config. Returns True if one existed."""
+
+        async with utils.safe_acquire() as conn:
+            result = await conn.execute(
+                "DELETE FROM restart_configs WHERE guild_id=$1",
+                int(guild_id)
+            )
+
+        self.configs[str(guild_id)] = None
+
+        self.warnings.schedule(int(guild_id), None)
+
+        return result != "DELETE 0"
 
     # =====================================================
     # DEFAULT CONFIG
     # =====================================================
 
-    def get_config(self, guild_id: int):
+    async def get_config(self, guild_id: int):
         """
         Get a server's restart configuration.
 
         If the server has never been configured, return defaults.
         """
 
-        guild_id = str(guild_id)
+        config = await self.load_config(guild_id)
 
-        if guild_id not in self.configs:
+        if config is None:
             return {
                 "interval": DEFAULT_INTERVAL,
                 "restart_time": DEFAULT_TIME,
                 "timezone": DEFAULT_TIMEZONE,
+                "warning_channel_id": None,
             }
 
-        config = self.configs[guild_id]
-
         return {
             "interval": int(config.get("interval", DEFAULT_INTERVAL)),
             "restart_time": config.get("restart_time", DEFAULT_TIME),
             "timezone": config.get("timezone", DEFAULT_TIMEZONE),
+            "warning_channel_id": config.get("warning_channel_id"),
         }
 
     # =====================================================
@@ -176,11 +560,15 @@ class RestartInfo(commands.Cog):
     def calculate_restart_times(
         self,
         config,
-        count=1
+        count=1,
+        now=None
     ):
         """
         Calculate the most recent restart and upcoming restarts.
 
+        `now` defaults to the current time; the scheduler passes its own
+        so every entry for one planning pass agrees.
+
         Returns:
             last_restart_local,
             upcoming_restart_list
@@ -202,7 +590,7 @@ class RestartInfo(commands.Cog):
 
         restart_hour, restart_minute = parsed
 
-        now_utc = datetime.now(timezone.utc)
+        now_utc = now or datetime.now(timezone.utc)
         now_local = now_utc.astimezone(timezone_obj)
 
         # -------------------------------------------------
@@ -272,7 +660,8 @@ class RestartInfo(commands.Cog):
     @app_commands.describe(
         interval="How often the server restarts.",
         restart_time="Time of the first restart, e.g. 8:00 PM or 20:00.",
-        timezone="Timezone used for the restart schedule."
+        timezone="Timezone used for the restart schedule.",
+        channel="Channel for restart warnings 30, 10 and 5 minutes before."
     )
     @app_commands.choices(
         interval=[
@@ -309,6 +698,7 @@ class RestartInfo(commands.Cog):
         interval: app_commands.Choice[int],
         restart_time: str,
         timezone: str = DEFAULT_TIMEZONE,
+        channel: Optional[discord.TextChannel] = None,
     ):
         """Configure the restart schedule for this Discord server."""
 
@@ -357,6 +747,22 @@ class RestartInfo(commands.Cog):
             )
             return
 
+        # -------------------------------------------------
+        # Validate warning channel
+        # -------------------------------------------------
+
+        if (
+            channel is not None
+            and not channel.permissions_for(
+                interaction.guild.me
+            ).send_messages
+        ):
+            await interaction.response.send_message(
+                f"❌ I can't send messages in {channel.mention}.",
+                ephemeral=True
+            )
+            return
+
         # -------------------------------------------------
         # Normalize time
         # -------------------------------------------------
@@ -367,23 +773,32 @@ class RestartInfo(commands.Cog):
 
         # -------------------------------------------------
         # Save configuration
+        #
+        # Omitting the channel keeps the current one.
         # -------------------------------------------------
 
-        guild_id = str(interaction.guild.id)
-
-        self.configs[guild_id] = {
-            "interval": interval.value,
-            "restart_time": normalized_time,
-            "timezone": timezone,
-        }
-
-        await self.save_configs()
+        if channel is not None:
+            warning_channel_id = channel.id
+        else:
+            warning_channel_id = (
+                await self.get_config(interaction.guild.id)
+            )["warning_channel_id"]
+
+        await self.save_config(
+            interaction.guild.id,
+            {
+                "interval": interval.value,
+                "restart_time": normalized_time,
+                "timezone": timezone,
+                "warning_channel_id": warning_channel_id,
+            }
+        )
 
         # -------------------------------------------------
         # Calculate next restart
         # -------------------------------------------------
 
-        config = self.get_config(interaction.guild.id)
+        config = await self.get_config(interaction.guild.id)
 
         last_restart, upcoming = self.calculate_restart_times(
             config,
@@ -422,6 +837,16 @@ class RestartInfo(commands.Cog):
             inline=True
         )
 
+        embed.add_field(
+            name="📢 Warnings",
+            value=(
+                f"<#{warning_channel_id}>"
+                if warning_channel_id
+                else "Off"
+            ),
+            inline=True
+        )
+
         embed.add_field(
             name="⏰ Next Restart",
             value=(
@@ -458,7 +883,7 @@ class RestartInfo(commands.Cog):
             )
             return
 
-        config = self.get_config(interaction.guild.id)
+        config = await self.get_config(interaction.guild.id)
 
         last_restart, upcoming = self.calculate_restart_times(
             config,
@@ -573,7 +998,7 @@ class RestartInfo(commands.Cog):
             )
             return
 
-        config = self.get_config(interaction.guild.id)
+        config = await self.get_config(interaction.guild.id)
 
         _, upcoming = self.calculate_restart_times(
             config,
@@ -635,7 +1060,7 @@ class RestartInfo(commands.Cog):
             )
             return
 
-        config = self.get_config(interaction.guild.id)
+        config = await self.get_config(interaction.guild.id)
 
         parsed = self.parse_time(config["restart_time"])
 
@@ -681,6 +1106,16 @@ class RestartInfo(commands.Cog):
             inline=True
         )
 
+        embed.add_field(
+            name="📢 Warnings",
+            value=(
+                f"<#{config['warning_channel_id']}>"
+                if config["warning_channel_id"]
+                else "Off"
+            ),
+            inline=True
+        )
+
         embed.add_field(
             name="📋 Configuration",
             value=(
@@ -724,11 +1159,7 @@ class RestartInfo(commands.Cog):
             )
             return
 
-        guild_id = str(interaction.guild.id)
-
-        if guild_id in self.configs:
-            del self.configs[guild_id]
-            await self.save_configs()
+        await self.delete_config(interaction.guild.id)
 
         embed = discord.Embed(
             title="🔄 Restart Schedule Reset",
@@ -1,6 +1,162 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
+from typing import Optional
+import asyncio
+import csv
+import io
+
+
+FOOTER_ICON = "https://i.postimg.cc/rmXpLFpv/ewn60cg6.png"
+
+# Names shown in a /rolequery result before it is truncated.
+MAX_QUERY_NAMES = 50
+
+# Names per /rolelist page.
+MEMBERS_PER_PAGE = 40
+
+
+def role_color(role: discord.Role):
+    return role.color if role.color.value else discord.Color.blurple()
+
+
+def export_members_csv(members, filename: str):
+    """
+    Write members to a CSV attachment row by row.
+
+    Rows are encoded straight into a byte buffer, so large roles never
+    become one big string.
+    """
+
+    buffer = io.BytesIO()
+
+    text = io.TextIOWrapper(buffer, encoding="utf-8", newline="")
+    writer = csv.writer(text)
+
+    writer.writerow(["user_id", "username", "display_name", "joined_at"])
+
+    for member in members:
+        writer.writerow([
+            member.id,
+            member.name,
+            member.display_name,
+            member.joined_at.isoformat() if member.joined_at else "",
+        ])
+
+    text.flush()
+    text.detach()
+    buffer.seek(0)
+
+    return discord.File(buffer, filename=filename)
+
+
+# =========================================================
+# MEMBER PAGES
+# =========================================================
+
+class MemberPageView(discord.ui.View):
+    """Single-embed member list; each page is rendered when shown."""
+
+    def __init__(
+        self,
+        owner_id: int,
+        role: discord.Role,
+        members: list
+    ):
+        super().__init__(timeout=300)
+
+        self.owner_id = owner_id
+        self.role = role
+        self.members = members
+        self.page = 0
+        self.pages = max(1, -(-len(members) // MEMBERS_PER_PAGE))
+        self.message: Optional[discord.Message] = None
+
+        self.previous_page = discord.ui.Button(
+            label="Previous",
+            emoji="◀️",
+            style=discord.ButtonStyle.secondary
+        )
+        self.previous_page.callback = self.go_previous
+
+        self.next_page = discord.ui.Button(
+            label="Next",
+            emoji="▶️",
+            style=discord.ButtonStyle.secondary
+        )
+        self.next_page.callback = self.go_next
+
+        self.add_item(self.previous_page)
+        self.add_item(self.next_page)
+
+        self.update_buttons()
+
+    def update_buttons(self):
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= self.pages - 1
+
+    def build_embed(self):
+        start = self.page * MEMBERS_PER_PAGE
+        shown = self.members[start:start + MEMBERS_PER_PAGE]
+
+        embed = discord.Embed(
+            title=f"{self.role.name} — Members",
+            description="\n".join(
+                f"• {member.display_name}"
+                for member in shown
+            ),
+            color=role_color(self.role)
+        )
+
+        embed.add_field(
+            name="Members",
+            value=str(len(self.members)),
+            inline=True
+        )
+
+        embed.set_footer(
+            text=f"DayZ Manager • Page {self.page + 1}/{self.pages}",
+            icon_url=FOOTER_ICON
+        )
+
+        embed.timestamp = discord.utils.utcnow()
+
+        return embed
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        if interaction.user.id == self.owner_id:
+            return True
+
+        await interaction.response.send_message(
+            "Only the person who ran /rolelist can change pages.",
+            ephemeral=True
+        )
+        return False
+
+    async def go_previous(self, interaction: discord.Interaction):
+        self.page = max(0, self.page - 1)
+        await self.show(interaction)
+
+    async def go_next(self, interaction: discord.Interaction):
+        self.page = min(self.pages - 1, self.page + 1)
+        await self.show(interaction)
+
+    async def show(self, interaction: discord.Interaction):
+        self.update_buttons()
+
+        await interaction.response.edit_message(
+            embed=self.build_embed(),
+            view=self
+        )
+
+    async def on_timeout(self):
+        if self.message is None:
+            return
+
+        try:
+            await self.message.edit(view=None)
+        except discord.HTTPException:
+            pass
 
 
 class RoleList(commands.Cog):
@@ -9,17 +165,193 @@ class RoleList(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
+        # guild_id -> running guild.chunk() task
+        self._chunking = {}
+
+        # guild_id -> role_id -> set of member IDs.
+        # Built from the member cache on first use, then kept current
+        # from member events.
+        self._index = {}
+
+    # =====================================================
+    # MEMBER CACHE
+    # =====================================================
+
+    async def ensure_chunked(self, guild: discord.Guild):
+        """Fill the gateway member cache once per guild."""
+
+        if guild.chunked:
+            return
+
+        task = self._chunking.get(guild.id)
+
+        if task is None:
+            task = asyncio.create_task(guild.chunk(cache=True))
+            self._chunking[guild.id] = task
+
+            task.add_done_callback(
+                lambda _: self._chunking.pop(guild.id, None)
+            )
+
+        await asyncio.shield(task)
+
+    # =====================================================
+    # ROLE INDEX
+    # =====================================================
+
+    @staticmethod
+    def member_role_ids(member: discord.Member):
+        return {
+            role.id
+            for role in member.roles
+            if not role.is_default()
+        }
+
+    async def guild_index(self, guild: discord.Guild):
+        """The guild's role -> member ID index, built on first use."""
+
+        index = self._index.get(guild.id)
+
+        if index is not None:
+            return index
+
+        # Concurrent callers share the one chunk request.
+        await self.ensure_chunked(guild)
+
+        index = self._index.get(guild.id)
+
+        if index is None:
+            index = {}
+
+            for member in guild.members:
+                for role_id in self.member_role_ids(member):
+                    index.setdefault(role_id, set()).add(member.id)
+
+            self._index[guild.id] = index
+
+        return index
+
+    @staticmethod
+    def indexed_members(index, role: discord.Role):
+        """Look a role up in a guild index. @everyone is not indexed."""
+
+        if role.is_default():
+            return {member.id for member in role.guild.members}
+
+        return index.get(role.id, set())
+
+    def indexed_role_count(self, guild_id: int, role_id: int):
+        """Member count for a role, or None if the guild isn't indexed."""
+
+        index = self._index.get(guild_id)
+
+        # The @everyone role shares the guild's ID and isn't indexed.
+        if index is None or role_id == guild_id:
+            return None
+
+        return len(index.get(role_id, ()))
+
+    async def role_member_ids(self, role: discord.Role):
+        """IDs of members holding a role. Do not mutate the result."""
+
+        index = await self.guild_index(role.guild)
+
+        return self.indexed_members(index, role)
+
+    async def role_members(self, role: discord.Role):
+        """Members holding a role, sorted by display name."""
+
+        return self.sorted_members(
+            role.guild,
+            await self.role_member_ids(role)
+        )
+
+    @staticmethod
+    def sorted_members(guild: discord.Guild, member_ids):
+        members = [
+            member
+            for member in map(guild.get_member, member_ids)
+            if member is not None
+        ]
+
+        members.sort(key=lambda member: member.display_name.lower())
+
+        return members
+
+    # =====================================================
+    # INDEX MAINTENANCE
+    # =====================================================
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        index = self._index.get(member.guild.id)
+
+        if index is None:
+            return
+
+        for role_id in self.member_role_ids(member):
+            index.setdefault(role_id, set()).add(member.id)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        index = self._index.get(member.guild.id)
+
+        if index is None:
+            return
+
+        for role_id in self.member_role_ids(member):
+            index.get(role_id, set()).discard(member.id)
+
+    @commands.Cog.listener()
+    async def on_member_update(
+        self,
+        before: discord.Member,
+        after: discord.Member
+    ):
+        index = self._index.get(after.guild.id)
+
+        if index is None:
+            return
+
+        old_roles = self.member_role_ids(before)
+        new_roles = self.member_role_ids(after)
+
+        for role_id in old_roles - new_roles:
+            index.get(role_id, set()).discard(after.id)
+
+        for role_id in new_roles - old_roles:
+            index.setdefault(role_id, set()).add(after.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        index = self._index.get(role.guild.id)
+
+        if index is not None:
+            index.pop(role.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self._index.pop(guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # A READY that isn't a resume rebuilds every guild without
+        # replaying member events, so the index may have missed changes.
+        self._index.clear()
+
     @app_commands.command(
         name="rolelist",
         description="Show everyone who has a specific role."
     )
     @app_commands.describe(
-        role="The role you want to see members of."
+        role="The role you want to see members of.",
+        export="Also attach the full list as a CSV with IDs and join dates."
     )
     async def rolelist(
         self,
         interaction: discord.Interaction,
-        role: discord.Role
+        role: discord.Role,
+        export: bool = False
     ):
         # Immediately acknowledge the command
         await interaction.response.defer()
@@ -32,97 +364,59 @@ class RoleList(commands.Cog):
             )
 
         try:
-            # Fetch EVERY member from Discord
-            members = [
-                member
-                async for member in interaction.guild.fetch_members(limit=None)
-            ]
-
-            # Find everyone with the selected role
-            role_members = [
-                member
-                for member in members
-                if role in member.roles
-            ]
-
-            # Sort alphabetically
-            role_members.sort(
-                key=lambda member: member.display_name.lower()
-            )
+            # Read the role's members from the gateway cache
+            role_members = await self.role_members(role)
 
             # No members
             if not role_members:
                 embed = discord.Embed(
                     title=f"{role.name}",
                     description="No members currently have this role.",
-                    color=(
-                        role.color
-                        if role.color.value
-                        else discord.Color.blurple()
-                    )
+                    color=role_color(role)
                 )
 
                 embed.set_footer(
                     text="DayZ Manager",
-                    icon_url="https://i.postimg.cc/rmXpLFpv/ewn60cg6.png"
+                    icon_url=FOOTER_ICON
                 )
 
                 embed.timestamp = discord.utils.utcnow()
 
                 return await interaction.followup.send(embed=embed)
 
-            # Build member list
-            member_list = "\n".join(
-                f"• {member.display_name}"
-                for member in role_members
+            # One embed; later pages are rendered on demand
+            view = MemberPageView(
+                interaction.user.id,
+                role,
+                role_members
             )
 
-            # Discord embeds have a 4096 character description limit
-            # Split the list if needed
-            chunks = []
-
-            while member_list:
-                if len(member_list) <= 4000:
-                    chunks.append(member_list)
-                    break
-
-                split_at = member_list.rfind("\n", 0, 4000)
-
-                if split_at == -1:
-                    split_at = 4000
-
-                chunks.append(member_list[:split_at])
-                member_list = member_list[split_at:].lstrip("\n")
-
-            # Send each chunk
-            for index, chunk in enumerate(chunks):
+            kwargs = {}
 
-                embed = discord.Embed(
-                    title=f"{role.name} — Members",
-                    description=chunk,
-                    color=(
-                        role.color
-                        if role.color.value
-                        else discord.Color.blurple()
-                    )
+            if export:
+                kwargs["file"] = await asyncio.to_thread(
+                    export_members_csv,
+                    role_members,
+                    f"role-{role.id}-members.csv"
                 )
 
-                # Only show count on first embed
-                if index == 0:
-                    embed.add_field(
-                        name="Members",
-                        value=str(len(role_members)),
-                        inline=True
-                    )
+            if view.pages > 1:
+                kwargs["view"] = view
+            else:
+                view.stop()
 
-                embed.set_footer(
-                    text="DayZ Manager",
-                    icon_url="https://i.postimg.cc/rmXpLFpv/ewn60cg6.png"
+            try:
+                message = await interaction.followup.send(
+                    embed=view.build_embed(),
+                    wait=True,
+                    **kwargs
                 )
+            finally:
+                if export:
+                    kwargs["file"].close()
 
-                embed.timestamp = discord.utils.utcnow()
-
-                await interaction.followup.send(embed=embed)
+            if view.pages > 1:
+                view.message = message
 
         except discord.Forbidden:
             await interaction.followup.send(
@@ -144,6 +438,94 @@ class RoleList(commands.Cog):
                 ephemeral=True
             )
 
+    # =====================================================
+    # /rolequery
+    # =====================================================
+
+    @app_commands.command(
+        name="rolequery",
+        description="Combine roles to find members, e.g. Faction-X and not Verified."
+    )
+    @app_commands.describe(
+        role="Members with this role.",
+        and_role="...who also have this role.",
+        or_role="...or who have this role instead.",
+        not_role="...excluding anyone with this role."
+    )
+    async def rolequery(
+        self,
+        interaction: discord.Interaction,
+        role: discord.Role,
+        and_role: Optional[discord.Role] = None,
+        or_role: Optional[discord.Role] = None,
+        not_role: Optional[discord.Role] = None
+    ):
+        if interaction.guild is None:
+            return await interaction.response.send_message(
+                "This command can only be used inside a server.",
+                ephemeral=True
+            )
+
+        await interaction.response.defer()
+
+        index = await self.guild_index(interaction.guild)
+
+        def members_of(r: discord.Role):
+            return self.indexed_members(index, r)
+
+        # Evaluated left to right: ((role | or) & and) - not
+        result = members_of(role)
+        query = f"{role.mention}"
+
+        if or_role is not None:
+            result = result | members_of(or_role)
+            query = f"({query} or {or_role.mention})"
+
+        if and_role is not None:
+            result = result & members_of(and_role)
+            query = f"{query} and {and_role.mention}"
+
+        if not_role is not None:
+            result = result - members_of(not_role)
+            query = f"{query} and not {not_role.mention}"
+
+        members = self.sorted_members(interaction.guild, result)
+
+        names = "\n".join(
+            f"• {member.display_name}"
+            for member in members[:MAX_QUERY_NAMES]
+        )
+
+        if len(members) > MAX_QUERY_NAMES:
+            names += f"\n…and {len(members) - MAX_QUERY_NAMES} more."
+
+        embed = discord.Embed(
+            title="Role Query",
+            description=(
+                f"{query}\n\n"
+                + (names or "No members match this query.")
+            ),
+            color=role_color(role)
+        )
+
+        embed.add_field(
+            name="Members",
+            value=str(len(members)),
+            inline=True
+        )
+
+        embed.set_footer(
+            text="DayZ Manager",
+            icon_url=FOOTER_ICON
+        )
+
+        embed.timestamp = discord.utils.utcnow()
+
+        await interaction.followup.send(
+            embed=embed,
+            allowed_mentions=discord.AllowedMentions.none()
+        )
+
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(RoleList(bot))
@@ -0,0 +1,52 @@
+import asyncio
+from types import SimpleNamespace
+
+from misc.rolelist import RoleList
+
+
+GUILD_ID = 1
+
+
+class FakeRole(SimpleNamespace):
+    def is_default(self):
+        return self.id == GUILD_ID
+
+
+def make_guild():
+    guild = SimpleNamespace(id=GUILD_ID, chunked=True, members=[])
+
+    everyone = FakeRole(id=GUILD_ID, guild=guild)
+    faction = FakeRole(id=10, guild=guild)
+    verified = FakeRole(id=11, guild=guild)
+
+    guild.members = [
+        SimpleNamespace(id=100, roles=[everyone, faction]),
+        SimpleNamespace(id=101, roles=[everyone, faction, verified]),
+        SimpleNamespace(id=102, roles=[everyone]),
+    ]
+
+    return guild, everyone, faction, verified
+
+
+def test_everyone_includes_every_member():
+    guild, everyone, _, _ = make_guild()
+    cog = RoleList(bot=None)
+
+    ids = asyncio.run(cog.role_member_ids(everyone))
+
+    assert ids == {100, 101, 102}
+
+
+def test_everyone_in_set_algebra():
+    guild, everyone, faction, verified = make_guild()
+    cog = RoleList(bot=None)
+
+    index = asyncio.run(cog.guild_index(guild))
+
+    def members_of(role):
+        return cog.indexed_members(index, role)
+
+    assert members_of(faction) & members_of(everyone) == {100, 101}
+    assert members_of(everyone) - members_of(verified) == {100, 102}
+    assert cog.indexed_role_count(GUILD_ID, faction.id) == 2
+    assert cog.indexed_role_count(GUILD_ID, everyone.id) is None